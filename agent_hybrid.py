@@ -53,6 +53,31 @@ class HybridReasoningAgent:
     - KV Cache：性能优化（对话历史、系统提示词自动缓存）
     """
     
+    # 明确告别时使用的 tool_choice（服务端强制调用，不改动提示词）
+    _END_TOOL_CHOICE = {"type": "function", "function": {"name": "end_conversation_detector"}}
+    
+    # 整句只是告别语（可带"好的""谢谢"等客套词和标点）时才算明确要结束对话
+    # 结束关键词只是出现在句中（如"计算 188*2""会议几点结束？"）时不强制，其他工具照常可用
+    _FAREWELL_RE = re.compile(
+        r"^(?:(?:好的?|好吧|嗯|行|ok|okay|谢谢(?:你|您)?|谢了|那就?|我)[\s\W_]*)*"
+        r"(?:再见|拜拜|bye(?:[\s-]*bye)?|goodbye|886|88|退出|quit|exit|不聊了|走了|下线了?|结束(?:对话|吧)?)"
+        r"(?:[\s\W_]*(?:再见|拜拜|bye|goodbye|88|啦|了|吧|哦|喽))*[\s\W_]*$",
+        re.IGNORECASE
+    )
+    
+    # 句中出现结束关键词但不是明确告别时，附在用户消息后的提示（所有工具仍可选）
+    _END_HINT = (
+        "[系统提示：用户输入包含可能表示结束对话的词语。仅当用户确实想结束对话时调用"
+        "end_conversation_detector，其他需求照常使用对应工具]"
+    )
+    
+    # 结束关键词：预编译成一个忽略大小写的正则，一次扫描完成匹配
+    _END_RE = re.compile("|".join(map(re.escape, [
+        '再见', '拜拜', 'bye', 'goodbye', '退出', '结束',
+        '关闭', '离开', '不聊了', '走了', 'quit', 'exit',
+        '886', '88', '下线', '断开'
+    ])), re.IGNORECASE)
+    
     def __init__(
         self,
         api_key: str = None,
@@ -96,6 +121,8 @@ class HybridReasoningAgent:
         
         # 对话历史（KV Cache会自动缓存）
         self.conversation_history = []
+        # 历史的估算token数（随历史增量维护，统计时无需遍历）
+        self.cached_tokens = 0
         
         # 系统提示词（会被KV Cache缓存，节省成本）
         self.system_prompt = self._create_system_prompt()
@@ -271,13 +298,11 @@ class HybridReasoningAgent:
     
     def _check_end_keywords(self, user_input: str) -> bool:
         """检查是否包含结束关键词"""
-        end_keywords = [
-            '再见', '拜拜', 'bye', 'goodbye', '退出', '结束',
-            '关闭', '离开', '不聊了', '走了', 'quit', 'exit',
-            '886', '88', '下线', '断开'
-        ]
-        user_lower = user_input.lower().strip()
-        return any(keyword in user_lower for keyword in end_keywords)
+        return self._END_RE.search(user_input) is not None
+    
+    def _is_farewell(self, user_input: str) -> bool:
+        """检查整句是否只是告别语（明确要结束对话）"""
+        return self._FAREWELL_RE.match(user_input.strip()) is not None
     
     def run(self, user_input: str, show_reasoning: bool = True) -> Dict[str, Any]:
         """
@@ -296,15 +321,18 @@ class HybridReasoningAgent:
             print("="*70)
         
         # 检测结束关键词
-        contains_end_keyword = self._check_end_keywords(user_input)
-        if contains_end_keyword and show_reasoning:
-            print(f"\n🔍 预处理：检测到结束关键词，将强制要求调用end_conversation_detector")
+        if show_reasoning:
+            if self._is_farewell(user_input):
+                print(f"\n🔍 预处理：检测到告别语，将强制调用end_conversation_detector")
+            elif self._check_end_keywords(user_input):
+                print(f"\n🔍 预处理：检测到结束关键词，提示模型判断是否结束对话")
         
         # 构建消息（利用KV Cache）
-        messages = self._build_messages(user_input, contains_end_keyword)
+        messages = self._build_messages(user_input)
         
         # 推理步骤记录
         reasoning_steps = []
+        tool_names = []
         tool_call_count = 0
         
         try:
@@ -318,7 +346,7 @@ class HybridReasoningAgent:
                 model=self.model,
                 messages=messages,
                 tools=self.openai_tools,
-                tool_choice="auto",  # 可以改为"required"强制调用工具
+                tool_choice=self._tool_choice(user_input),
                 temperature=self.temperature
             )
             
@@ -371,6 +399,7 @@ class HybridReasoningAgent:
                         'arguments': arguments,
                         'result': result
                     })
+                    tool_names.append(tool_name)
                     
                     # 添加工具结果到消息
                     messages.append({
@@ -399,15 +428,13 @@ class HybridReasoningAgent:
                 final_answer = assistant_message.content
             
             # 更新对话历史（用于KV Cache）
+            # 一问一答一次性追加
             if self.enable_cache:
-                self.conversation_history.append({
-                    "role": "user",
-                    "content": user_input
-                })
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": final_answer
-                })
+                self.conversation_history.extend([
+                    {"role": "user", "content": user_input},
+                    {"role": "assistant", "content": final_answer}
+                ])
+                self.cached_tokens += len(user_input) // 4 + len(final_answer) // 4
             
             # 分割句子（为TTS准备）
             sentences = self._split_sentences(final_answer)
@@ -432,6 +459,7 @@ class HybridReasoningAgent:
                 'output': final_answer,
                 'sentences': sentences,
                 'reasoning_steps': reasoning_steps,
+                'tool_names': tool_names,
                 'tool_calls': tool_call_count,
                 'should_end': should_end,
                 'cached_tokens': len(self.conversation_history) if self.enable_cache else 0
@@ -446,7 +474,18 @@ class HybridReasoningAgent:
                 'error': str(e)
             }
     
-    def _build_messages(self, user_input: str, force_end_detection: bool = False) -> List[Dict]:
+    def _tool_choice(self, user_input: str):
+        """
+        第一次调用的 tool_choice
+        
+        整句是告别语时通过 tool_choice 强制调用end_conversation_detector；
+        其他情况（包括句中含结束关键词）使用"auto"，所有工具都可选
+        """
+        if self._is_farewell(user_input) and self._END_TOOL_CHOICE["function"]["name"] in self.tool_map:
+            return self._END_TOOL_CHOICE
+        return "auto"  # 可以改为"required"强制调用工具
+    
+    def _build_messages(self, user_input: str) -> List[Dict]:
         """
         构建消息列表
         
@@ -462,15 +501,15 @@ class HybridReasoningAgent:
             messages.extend(self.conversation_history)
         
         # 添加当前输入
-        user_message = user_input
-        if force_end_detection:
-            user_message += "\n\n[系统要求：检测到结束关键词，必须调用end_conversation_detector工具]"
-        
         messages.append({
             "role": "user",
-            "content": user_message
+            "content": user_input
         })
         
+        # 含结束关键词但不是明确告别：只提示，不强制（明确告别由 tool_choice 强制）
+        if self._check_end_keywords(user_input) and not self._is_farewell(user_input):
+            messages.append({"role": "system", "content": self._END_HINT})
+        
         return messages
     
     def _display_tool_call(self, step: int, tool_name: str, arguments: Dict):
@@ -521,6 +560,64 @@ class HybridReasoningAgent:
         except:
             return False
     
+    def reason(self, user_input: str, show_reasoning: bool = False) -> Dict[str, Any]:
+        """
+        只执行推理并准备TTS分段，不播放
+        
+        对话历史按实例保存，并发推理时每个线程应使用独立的Agent实例
+        
+        Args:
+            user_input: 用户输入
+            show_reasoning: 是否显示推理过程
+            
+        Returns:
+            run() 的结果字典，启用TTS时额外包含 tts_batch
+        """
+        result = self.run(user_input, show_reasoning)
+        
+        if result['success'] and self.enable_tts:
+            result['tts_batch'] = self.tts_optimizer.text_optimizer.optimize_batch(result['output'])
+        
+        return result
+    
+    def play(self, result: Dict[str, Any], simulate_mode: bool = True) -> Dict[str, Any]:
+        """
+        播放 reason() 准备好的TTS分段（同一时间只应有一个调用）
+        
+        Args:
+            result: reason() 的返回值
+            simulate_mode: 是否模拟模式（无真实TTS引擎时）
+            
+        Returns:
+            合并了 tts_chunks, tts_success, total_tts_chunks 的结果字典
+        """
+        batch = result.pop('tts_batch', None)
+        if batch is None:
+            return result
+        
+        print(f"\n{'='*70}")
+        print("🎵 TTS音频播放")
+        print(f"{'='*70}\n")
+        
+        if batch:
+            print(f"✅ 生成 {len(batch)} 个TTS分段")
+            tts_success = self.tts_optimizer.audio_manager.play_chunks(
+                batch,
+                simulate_mode=simulate_mode
+            )
+        else:
+            print("⚠️  没有可播放内容")
+            tts_success = False
+        
+        # 合并结果
+        result.update({
+            'tts_chunks': batch.to_dicts(),
+            'tts_success': tts_success,
+            'total_tts_chunks': len(batch)
+        })
+        
+        return result
+    
     def run_with_tts(self, 
                      user_input: str, 
                      show_reasoning: bool = True,
@@ -545,7 +642,7 @@ class HybridReasoningAgent:
             self.voice_feedback.start('thinking')
         
         # 执行推理
-        result = self.run(user_input, show_reasoning)
+        result = self.reason(user_input, show_reasoning)
         
         # 停止语音反馈
         if self.voice_mode:
@@ -554,24 +651,8 @@ class HybridReasoningAgent:
         if not result['success']:
             return result
         
-        # TTS优化并播放
-        print(f"\n{'='*70}")
-        print("🎵 TTS音频播放")
-        print(f"{'='*70}\n")
-        
-        tts_result = self.tts_optimizer.optimize_and_play(
-            text=result['output'],
-            simulate_mode=simulate_mode
-        )
-        
-        # 合并结果
-        result.update({
-            'tts_chunks': tts_result.get('tts_chunks', []),
-            'tts_success': tts_result.get('success', False),
-            'total_tts_chunks': tts_result.get('total_chunks', 0)
-        })
-        
-        return result
+        # TTS播放
+        return self.play(result, simulate_mode=simulate_mode)
     
     def run_with_tts_demo(self, 
                           user_input: str,
@@ -640,6 +721,7 @@ class HybridReasoningAgent:
     def clear_cache(self):
         """清除对话历史缓存"""
         self.conversation_history = []
+        self.cached_tokens = 0
         print("✅ 对话历史已清除（KV Cache重置）")
     
     def get_cache_stats(self) -> Dict:
@@ -647,10 +729,7 @@ class HybridReasoningAgent:
         return {
             'conversation_turns': len(self.conversation_history) // 2,
             'total_messages': len(self.conversation_history),
-            'estimated_cached_tokens': sum(
-                len(msg['content']) // 4 
-                for msg in self.conversation_history
-            ),
+            'estimated_cached_tokens': self.cached_tokens,
             'system_prompt_tokens': len(self.system_prompt) // 4
         }
 
@@ -3,7 +3,9 @@
 展示OpenAI原生API + LangChain工具 + KV Cache的威力
 """
 from agent_hybrid import HybridReasoningAgent
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # 尝试导入colorama
 try:
@@ -18,47 +20,66 @@ except ImportError:
         BRIGHT = RESET_ALL = ""
 
 
+# 欢迎界面/示例文本在导入时一次性拼好,打印时整段写出
+# (autoreset 只在每次 write 结束时复位,所以彩色行需要显式 RESET_ALL)
+_HEADER_STR = "\n".join([
+    "",
+    "=" * 80,
+    Fore.CYAN + Style.BRIGHT + "🚀 混合架构AI Agent - 语音交互版" + Style.RESET_ALL,
+    "=" * 80,
+    "",
+    Fore.GREEN + "✨ 核心优势：" + Style.RESET_ALL,
+    "  📊 OpenAI原生API - 100%可靠的工具调用",
+    "  🛠️  LangChain工具池 - 17个强大工具",
+    "  ⚡ KV Cache优化 - 多轮对话速度提升3-5倍",
+    "  🗣️  Edge TTS - 真实语音播放（晓晓语音）",
+    "",
+    Fore.YELLOW + "🎯 语音功能：" + Style.RESET_ALL,
+    "  • 🔊 真实语音播放 - Edge TTS 免费高质量",
+    "  • 🎵 智能分句 - 自然流畅的语音节奏",
+    "  • 🛡️  防重叠播放 - 稳定可靠的音频管理",
+    "  • 💡 推理可视化 - 完整展示思考过程",
+    "",
+    Fore.RED + "🔊 请确保扬声器已开启，音量适中！" + Style.RESET_ALL,
+    "-" * 80,
+]) + "\n"
+
+_EXAMPLES = [
+    "1️⃣  现在几点了？（语音播报时间）",
+    "2️⃣  计算sqrt(2)保留3位小数（听听计算结果）",
+    "3️⃣  图书馆有哪些关于Python的书（JSON转语音）",
+    "4️⃣  100摄氏度等于多少华氏度（单位转换）",
+    "5️⃣  帮我登记访客信息（前台接待）",
+    "6️⃣  明天上午10点提醒我开会（设置提醒）",
+    "7️⃣  再见（自动结束 + 语音道别）✨",
+]
+
+_EXAMPLES_STR = "\n".join([
+    "",
+    Fore.MAGENTA + "💡 试试这些命令（会播放语音）：" + Style.RESET_ALL,
+    *(f"  {ex}" for ex in _EXAMPLES),
+    "",
+    Fore.RED + "⌨️  命令：" + Style.RESET_ALL,
+    "  • 'q' 或 'quit' - 退出",
+    "  • 'help' - 查看帮助",
+    "  • 'stats' - 查看缓存统计",
+    "  • 'clear' - 清除对话历史",
+    "",
+    Fore.YELLOW + "💡 提示：Agent回答后会自动播放语音！" + Style.RESET_ALL,
+    "-" * 80,
+]) + "\n"
+
+
 def print_header():
     """打印欢迎界面"""
-    print("\n" + "=" * 80)
-    print(Fore.CYAN + Style.BRIGHT + "🚀 混合架构AI Agent - 语音交互版")
-    print("=" * 80)
-    print("\n" + Fore.GREEN + "✨ 核心优势：")
-    print("  📊 OpenAI原生API - 100%可靠的工具调用")
-    print("  🛠️  LangChain工具池 - 17个强大工具")
-    print("  ⚡ KV Cache优化 - 多轮对话速度提升3-5倍")
-    print("  🗣️  Edge TTS - 真实语音播放（晓晓语音）")
-    print("\n" + Fore.YELLOW + "🎯 语音功能：")
-    print("  • 🔊 真实语音播放 - Edge TTS 免费高质量")
-    print("  • 🎵 智能分句 - 自然流畅的语音节奏")
-    print("  • 🛡️  防重叠播放 - 稳定可靠的音频管理")
-    print("  • 💡 推理可视化 - 完整展示思考过程")
-    print("\n" + Fore.RED + "🔊 请确保扬声器已开启，音量适中！")
-    print("-" * 80)
+    sys.stdout.write(_HEADER_STR)
+    sys.stdout.flush()
 
 
 def print_examples():
     """打印示例"""
-    print("\n" + Fore.MAGENTA + "💡 试试这些命令（会播放语音）：")
-    examples = [
-        "1️⃣  现在几点了？（语音播报时间）",
-        "2️⃣  计算sqrt(2)保留3位小数（听听计算结果）",
-        "3️⃣  图书馆有哪些关于Python的书（JSON转语音）",
-        "4️⃣  100摄氏度等于多少华氏度（单位转换）",
-        "5️⃣  帮我登记访客信息（前台接待）",
-        "6️⃣  明天上午10点提醒我开会（设置提醒）",
-        "7️⃣  再见（自动结束 + 语音道别）✨",
-    ]
-    for ex in examples:
-        print(f"  {ex}")
-    
-    print("\n" + Fore.RED + "⌨️  命令：")
-    print("  • 'q' 或 'quit' - 退出")
-    print("  • 'help' - 查看帮助")
-    print("  • 'stats' - 查看缓存统计")
-    print("  • 'clear' - 清除对话历史")
-    print("\n" + Fore.YELLOW + "💡 提示：Agent回答后会自动播放语音！")
-    print("-" * 80)
+    sys.stdout.write(_EXAMPLES_STR)
+    sys.stdout.flush()
 
 
 def display_cache_stats(agent):
@@ -164,14 +185,25 @@ def main():
             traceback.print_exc()
 
 
+def _timed_reason(agent, query):
+    """执行推理并记录耗时"""
+    start_time = time.time()
+    result = agent.reason(query, show_reasoning=False)
+    return result, time.time() - start_time
+
+
 def test_mode():
-    """测试模式 - 对比性能（带真实语音）"""
+    """
+    测试模式 - 对比性能（带真实语音）
+    
+    各用例的LLM推理相互独立且受网络延迟主导，先全部并发发出；
+    每个用例使用独立Agent（对话历史不共享，并发推理互不干扰）；
+    语音播放只能一个个来，按用例顺序依次播放
+    """
     print("\n" + "=" * 80)
     print(Fore.CYAN + Style.BRIGHT + "🧪 混合架构性能测试 + TTS 播放")
     print("=" * 80)
     
-    agent = HybridReasoningAgent(enable_cache=True, enable_tts=True, voice_mode=True)
-    
     test_cases = [
         ("数学计算", "计算sqrt(2)保留3位小数"),
         ("时间查询", "现在几点？"),
@@ -179,44 +211,50 @@ def test_mode():
         ("对话结束", "好的，再见！"),
     ]
     
-    print("\n开始测试...（每次都会播放语音）\n")
+    agents = [
+        HybridReasoningAgent(enable_cache=True, enable_tts=True, voice_mode=True)
+        for _ in test_cases
+    ]
     
-    for i, (name, query) in enumerate(test_cases, 1):
-        print(f"{Fore.YELLOW}{'─'*70}")
-        print(f"{Fore.YELLOW}测试 {i}/{len(test_cases)}: {name}")
-        print(f"{Fore.YELLOW}{'─'*70}")
-        
-        start_time = time.time()
-        # 使用真实 TTS 播放
-        result = agent.run_with_tts(query, show_reasoning=False, simulate_mode=False)
-        elapsed = time.time() - start_time
-        
-        if result['success']:
-            print(f"{Fore.GREEN}✅ 成功")
-            print(f"   耗时: {elapsed:.2f}秒")
-            print(f"   工具调用: {result['tool_calls']}次")
-            if result.get('total_tts_chunks', 0) > 0:
-                print(f"   TTS分段: {result['total_tts_chunks']}个")
-                print(f"   语音播放: {'✅ 完成' if result.get('tts_success') else '❌ 失败'}")
-            if i > 1:
-                print(f"   KV Cache: 已优化")
-        else:
-            print(f"{Fore.RED}❌ 失败: {result['output']}")
+    print("\n开始测试...（推理并发执行，语音按顺序播放）\n")
+    
+    total_start = time.time()
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        futures = [
+            executor.submit(_timed_reason, agent, query)
+            for agent, (_, query) in zip(agents, test_cases)
+        ]
         
-        time.sleep(0.5)
+        for i, ((name, query), agent, future) in enumerate(zip(test_cases, agents, futures), 1):
+            print(f"{Fore.YELLOW}{'─'*70}")
+            print(f"{Fore.YELLOW}测试 {i}/{len(test_cases)}: {name}")
+            print(f"{Fore.YELLOW}{'─'*70}")
+            
+            result, elapsed = future.result()
+            
+            if result['success']:
+                # 使用真实 TTS 播放
+                play_start = time.time()
+                result = agent.play(result, simulate_mode=False)
+                play_time = time.time() - play_start
+                
+                print(f"{Fore.GREEN}✅ 成功")
+                print(f"   推理耗时: {elapsed:.2f}秒")
+                print(f"   工具调用: {result['tool_calls']}次")
+                if result.get('total_tts_chunks', 0) > 0:
+                    print(f"   TTS分段: {result['total_tts_chunks']}个")
+                    print(f"   语音播放: {'✅ 完成' if result.get('tts_success') else '❌ 失败'} ({play_time:.2f}秒)")
+            else:
+                print(f"{Fore.RED}❌ 失败: {result['output']}")
+            
+            time.sleep(0.5)
     
-    # 显示缓存统计
-    print(f"\n{Fore.CYAN}{'='*70}")
-    print(f"{Fore.CYAN}最终统计")
-    print(f"{Fore.CYAN}{'='*70}")
-    display_cache_stats(agent)
+    print(f"\n{Fore.GREEN}⚡ 总耗时: {time.time() - total_start:.2f}秒")
     
     print(f"{Fore.GREEN}✅ 测试完成！\n")
 
 
 if __name__ == "__main__":
-    import sys
-    
     # 检查命令行参数
     if len(sys.argv) > 1 and sys.argv[1] == 'test':
         test_mode()
@@ -3,8 +3,12 @@
 
 使用方式:
     python examples/demo_new_architecture.py
+    python examples/demo_new_architecture.py --parallel   # 并发执行测试用例
 """
+import argparse
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 添加src目录到路径
@@ -15,8 +19,49 @@ from src.core import HybridReasoningAgent, settings
 from src.tools import load_all_tools
 
 
-def main():
-    """主函数"""
+def run_parallel(tools, test_cases):
+    """
+    并发执行测试用例
+
+    每个用例使用独立Agent(对话历史互不干扰),同时发出请求,总耗时约为最慢用例
+    """
+    agents = [
+        HybridReasoningAgent(tools=tools, enable_cache=settings.enable_cache)
+        for _ in test_cases
+    ]
+
+    print(f"🧪 开始并发测试({len(test_cases)}个用例)...\n")
+
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        futures = [
+            executor.submit(agent.run, query, show_reasoning=False)
+            for agent, (_, query) in zip(agents, test_cases)
+        ]
+
+        # 按用例顺序输出结果
+        for i, ((name, query), future) in enumerate(zip(test_cases, futures), 1):
+            result = future.result()
+            print(f"{'─'*80}")
+            print(f"测试 {i}/{len(test_cases)}: {name}")
+            print(f"查询: {query}")
+            print(f"{'─'*80}")
+            if result.success:
+                print(f"✅ 成功: {result.output[:100]}")
+                print(f"   工具调用: {result.tool_calls}次\n")
+            else:
+                print(f"❌ 失败: {result.error}\n")
+
+    print(f"⚡ 总耗时: {time.time() - start_time:.2f}秒\n")
+
+
+def main(parallel: bool = False):
+    """
+    主函数
+
+    Args:
+        parallel: 是否并发执行测试用例
+    """
     print("\n" + "="*80)
     print("🚀 新架构演示 - 混合架构AI Agent")
     print("="*80)
@@ -26,6 +71,17 @@ def main():
     tools = load_all_tools()
     print(f"✅ 已加载 {len(tools)} 个工具\n")
 
+    # 测试用例
+    test_cases = [
+        ("数学计算", "计算sqrt(2)保留3位小数"),
+        ("时间查询", "现在几点了?"),
+        ("对话结束", "好的,再见!"),
+    ]
+
+    if parallel:
+        run_parallel(tools, test_cases)
+        return
+
     # 创建Agent
     print("🤖 正在初始化Agent...")
     agent = HybridReasoningAgent(
@@ -34,13 +90,6 @@ def main():
     )
     print()
 
-    # 测试用例
-    test_cases = [
-        ("数学计算", "计算sqrt(2)保留3位小数"),
-        ("时间查询", "现在几点了?"),
-        ("对话结束", "好的,再见!"),
-    ]
-
     print("🧪 开始测试...\n")
 
     for i, (name, query) in enumerate(test_cases, 1):
@@ -77,8 +126,12 @@ def main():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="新架构演示")
+    parser.add_argument('--parallel', action='store_true', help='并发执行测试用例')
+    args = parser.parse_args()
+
     try:
-        main()
+        main(parallel=args.parallel)
     except KeyboardInterrupt:
         print("\n\n👋 程序被中断,再见!\n")
     except Exception as e:
@@ -6,6 +6,7 @@ Robot Agent Mindflow - 主入口
     python main.py              # 启动交互式对话
     python main.py --no-tts     # 禁用语音
     python main.py --test       # 测试模式
+    python main.py --test --parallel  # 并发测试模式
 """
 import sys
 from pathlib import Path
@@ -14,104 +15,186 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.core import HybridReasoningAgent
+from src.core import HybridReasoningAgent, AgentResponse
 from src.core.config import settings
 from src.tools import load_all_tools
-from src.services.tts import TTSFactory, TTSProvider, TTSOptimizer
-from src.services.voice import VoiceWaitingFeedback
 import argparse
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-# 尝试导入colorama
-try:
-    from colorama import init, Fore, Style
-    init(autoreset=True)
-    HAS_COLOR = True
-except ImportError:
-    HAS_COLOR = False
+# 尝试导入colorama(仅在终端输出且未设置 NO_COLOR 时启用,重定向/管道时不包装stdout)
+HAS_COLOR = False
+if sys.stdout.isatty() and 'NO_COLOR' not in os.environ:
+    try:
+        from colorama import init, Fore, Style
+        init(autoreset=True)
+        HAS_COLOR = True
+    except ImportError:
+        pass
+
+if not HAS_COLOR:
     class Fore:
         CYAN = YELLOW = GREEN = MAGENTA = RED = BLUE = WHITE = ""
     class Style:
         BRIGHT = RESET_ALL = ""
 
 
+# 分隔线
+_SEP80 = "=" * 80
+_SEP70 = "=" * 70
+_RULE80 = "-" * 80
+_DASH70 = "─" * 70
+
+
+@functools.lru_cache(maxsize=1)
+def _tools():
+    """加载工具(进程内只加载一次,多个VoiceAgent共用)"""
+    return load_all_tools()
+
+
+@functools.lru_cache(maxsize=None)
+def _tts_engine(voice: str, rate: str, volume: str):
+    """创建Edge TTS引擎(相同参数只创建一次)"""
+    from src.services.tts import TTSFactory, TTSProvider
+
+    return TTSFactory.create_tts(
+        provider=TTSProvider.EDGE,
+        voice=voice,
+        rate=rate,
+        volume=volume
+    )
+
+
+# 欢迎界面/示例文本在导入时一次性拼好,打印时整段写出
+# (autoreset 只在每次 write 结束时复位,所以彩色行需要显式 RESET_ALL)
+_HEADER_STR = "\n".join([
+    "",
+    _SEP80,
+    Fore.CYAN + Style.BRIGHT + "🚀 Robot Agent Mindflow - 语音交互版" + Style.RESET_ALL,
+    _SEP80,
+    "",
+    Fore.GREEN + "✨ 核心优势:" + Style.RESET_ALL,
+    "  📊 OpenAI原生API - 100%可靠的工具调用",
+    "  🛠️  LangChain工具池 - 17个强大工具",
+    "  ⚡ KV Cache优化 - 多轮对话速度提升3-5倍",
+    "  🗣️  Edge TTS - 真实语音播放(晓晓语音)",
+    "",
+    Fore.YELLOW + "🎯 新架构特性:" + Style.RESET_ALL,
+    "  • 🏗️  分层架构 - Core / Services / Tools",
+    "  • 🔧 模块化设计 - 易于维护和扩展",
+    "  • ⚙️  配置管理 - Pydantic类型验证",
+    "  • 📖 完整文档 - 架构设计 + 迁移指南",
+    _RULE80,
+]) + "\n"
+
+_EXAMPLES = [
+    "1️⃣  现在几点了?(语音播报时间)",
+    "2️⃣  计算sqrt(2)保留3位小数(听听计算结果)",
+    "3️⃣  图书馆有哪些关于Python的书(JSON转语音)",
+    "4️⃣  100摄氏度等于多少华氏度(单位转换)",
+    "5️⃣  帮我登记访客信息(前台接待)",
+    "6️⃣  明天上午10点提醒我开会(设置提醒)",
+    "7️⃣  再见(自动结束 + 语音道别)✨",
+]
+
+_EXAMPLES_STR = "\n".join([
+    "",
+    Fore.MAGENTA + "💡 试试这些命令(会播放语音):" + Style.RESET_ALL,
+    *(f"  {ex}" for ex in _EXAMPLES),
+    "",
+    Fore.RED + "⌨️  命令:" + Style.RESET_ALL,
+    "  • 'q' 或 'quit' - 退出",
+    "  • 'help' - 查看帮助",
+    "  • 'stats' - 查看缓存统计",
+    "  • 'clear' - 清除对话历史",
+    _RULE80,
+]) + "\n"
+
+
 def print_header():
     """打印欢迎界面"""
-    print("\n" + "="*80)
-    print(Fore.CYAN + Style.BRIGHT + "🚀 Robot Agent Mindflow - 语音交互版")
-    print("="*80)
-    print("\n" + Fore.GREEN + "✨ 核心优势:")
-    print("  📊 OpenAI原生API - 100%可靠的工具调用")
-    print("  🛠️  LangChain工具池 - 17个强大工具")
-    print("  ⚡ KV Cache优化 - 多轮对话速度提升3-5倍")
-    print("  🗣️  Edge TTS - 真实语音播放(晓晓语音)")
-    print("\n" + Fore.YELLOW + "🎯 新架构特性:")
-    print("  • 🏗️  分层架构 - Core / Services / Tools")
-    print("  • 🔧 模块化设计 - 易于维护和扩展")
-    print("  • ⚙️  配置管理 - Pydantic类型验证")
-    print("  • 📖 完整文档 - 架构设计 + 迁移指南")
-    print("-"*80)
+    sys.stdout.write(_HEADER_STR)
+    sys.stdout.flush()
 
 
 def print_examples():
     """打印示例"""
-    print("\n" + Fore.MAGENTA + "💡 试试这些命令(会播放语音):")
-    examples = [
-        "1️⃣  现在几点了?(语音播报时间)",
-        "2️⃣  计算sqrt(2)保留3位小数(听听计算结果)",
-        "3️⃣  图书馆有哪些关于Python的书(JSON转语音)",
-        "4️⃣  100摄氏度等于多少华氏度(单位转换)",
-        "5️⃣  帮我登记访客信息(前台接待)",
-        "6️⃣  明天上午10点提醒我开会(设置提醒)",
-        "7️⃣  再见(自动结束 + 语音道别)✨",
-    ]
-    for ex in examples:
-        print(f"  {ex}")
-
-    print("\n" + Fore.RED + "⌨️  命令:")
-    print("  • 'q' 或 'quit' - 退出")
-    print("  • 'help' - 查看帮助")
-    print("  • 'stats' - 查看缓存统计")
-    print("  • 'clear' - 清除对话历史")
-    print("-"*80)
+    sys.stdout.write(_EXAMPLES_STR)
+    sys.stdout.flush()
 
 
 def display_cache_stats(agent):
-    """显示缓存统计"""
-    stats = agent.get_stats()
-    print(f"\n{Fore.CYAN}{'='*70}")
-    print(f"{Fore.CYAN}📊 KV Cache 统计信息")
-    print(f"{Fore.CYAN}{'='*70}")
-    print(f"{Fore.GREEN}Agent名称: {Fore.WHITE}{stats['agent_name']}")
-    print(f"{Fore.GREEN}对话轮次: {Fore.WHITE}{stats['conversation_turns']}")
-    print(f"{Fore.GREEN}总消息数: {Fore.WHITE}{stats['total_messages']}")
-    print(f"{Fore.GREEN}缓存tokens: {Fore.WHITE}~{stats['estimated_cached_tokens']} tokens")
-    print(f"{Fore.GREEN}系统提示词: {Fore.WHITE}~{stats['system_prompt_tokens']} tokens (已缓存50% off)")
-
-    # 估算节省
-    if stats['conversation_turns'] > 0:
-        saved = stats['estimated_cached_tokens'] * 0.5
-        print(f"\n{Fore.YELLOW}💰 预估节省: ~{int(saved)} tokens 成本")
-    print(f"{Fore.CYAN}{'='*70}\n")
+    """显示缓存统计(对话未变化时直接复用上次渲染的文本)"""
+    version = agent.stats_version
+    rendered = agent._stats_render
+    if rendered is None or rendered[0] != version:
+        stats = agent.get_stats()
+        lines = [
+            "",
+            f"{Fore.CYAN}{_SEP70}{Style.RESET_ALL}",
+            f"{Fore.CYAN}📊 KV Cache 统计信息{Style.RESET_ALL}",
+            f"{Fore.CYAN}{_SEP70}{Style.RESET_ALL}",
+            f"{Fore.GREEN}Agent名称: {Fore.WHITE}{stats['agent_name']}{Style.RESET_ALL}",
+            f"{Fore.GREEN}对话轮次: {Fore.WHITE}{stats['conversation_turns']}{Style.RESET_ALL}",
+            f"{Fore.GREEN}总消息数: {Fore.WHITE}{stats['total_messages']}{Style.RESET_ALL}",
+            f"{Fore.GREEN}缓存tokens: {Fore.WHITE}~{stats['estimated_cached_tokens']} tokens{Style.RESET_ALL}",
+            f"{Fore.GREEN}系统提示词: {Fore.WHITE}~{stats['system_prompt_tokens']} tokens (已缓存50% off){Style.RESET_ALL}",
+        ]
+
+        # 估算节省
+        if stats['conversation_turns'] > 0:
+            saved = stats['estimated_cached_tokens'] * 0.5
+            lines.append("")
+            lines.append(f"{Fore.YELLOW}💰 预估节省: ~{int(saved)} tokens 成本{Style.RESET_ALL}")
+        lines.append(f"{Fore.CYAN}{_SEP70}{Style.RESET_ALL}")
+        lines.append("")
+
+        rendered = (version, "\n".join(lines) + "\n")
+        agent._stats_render = rendered
+
+    sys.stdout.write(rendered[1])
+    sys.stdout.flush()
 
 
 class VoiceAgent:
     """语音交互Agent封装"""
 
-    def __init__(self, enable_tts: bool = True, voice_mode: bool = True):
+    # 响应缓存: 上下文摘要 + 用户输入 -> AgentResponse
+    # L1: 进程内LRU; L2: 配置 RESPONSE_CACHE_DB 后持久化到SQLite,跨进程/重启复用
+    # 只有温度为0且调用了工具、所用工具都是纯函数(结果不随时间/外部状态变化)的回答才会被缓存
+    _response_cache: "OrderedDict[str, object]" = OrderedDict()
+    _RESPONSE_CACHE_SIZE = 128
+    _response_cache_lock = threading.Lock()  # 并行测试模式下多线程共享L1
+    _response_db: Optional[sqlite3.Connection] = None
+    _response_db_lock = threading.Lock()
+    _CACHEABLE_TOOLS = frozenset({
+        'calculator', 'text_analyzer', 'unit_converter',
+        'logic_reasoning', 'end_conversation_detector'
+    })
+
+    def __init__(self, enable_tts: bool = True, voice_mode: bool = True, verbose: bool = True):
         """
         初始化语音Agent
 
         Args:
             enable_tts: 是否启用TTS
             voice_mode: 是否启用语音等待反馈
+            verbose: 是否打印TTS逐段生成/播放的详细计时
         """
         self.enable_tts = enable_tts
         self.voice_mode = voice_mode
 
         # 加载工具
         print(f"\n{Fore.CYAN}📦 正在加载工具...")
-        self.tools = load_all_tools()
+        self.tools = _tools()
         print(f"{Fore.GREEN}✅ 已加载 {len(self.tools)} 个工具")
 
         # 创建Agent
@@ -126,11 +209,13 @@ class VoiceAgent:
         if self.enable_tts:
             print(f"{Fore.CYAN}🎵 正在初始化TTS服务...")
             try:
-                tts_engine = TTSFactory.create_tts(
-                    provider=TTSProvider.EDGE,
-                    voice=settings.tts_voice,
-                    rate=settings.tts_rate,
-                    volume=settings.tts_volume
+                # TTS服务按需导入(--no-tts 时不加载)
+                from src.services.tts import TTSOptimizer
+
+                tts_engine = _tts_engine(
+                    settings.tts_voice,
+                    settings.tts_rate,
+                    settings.tts_volume
                 )
 
                 self.tts_optimizer = TTSOptimizer(
@@ -138,24 +223,197 @@ class VoiceAgent:
                     max_chunk_length=settings.max_chunk_length,
                     max_retries=3,
                     timeout_per_chunk=10,
-                    buffer_size=3
+                    buffer_size=3,
+                    verbose=verbose
                 )
                 print(f"{Fore.GREEN}✅ TTS服务初始化成功 ({settings.tts_voice})")
+
+                # 用户输入第一句话期间在后台启动事件循环、初始化音频设备,首句播放无需再等
+                if settings.tts_warmup:
+                    threading.Thread(
+                        target=self.tts_optimizer.warmup,
+                        name="tts-warmup",
+                        daemon=True
+                    ).start()
             except Exception as e:
                 print(f"{Fore.RED}⚠️  TTS初始化失败: {e}")
                 print(f"{Fore.YELLOW}💡 将以文本模式运行")
                 self.enable_tts = False
 
+        # 上次渲染的统计文本: (stats_version, text)
+        self._stats_render = None
+
         # 语音反馈
         if self.voice_mode:
+            from src.services.voice import VoiceWaitingFeedback
             self.voice_feedback = VoiceWaitingFeedback(mode='text')
 
         print(f"{Fore.GREEN}✅ 初始化完成!\n")
 
+    def _cache_key(self, user_input: str) -> str:
+        """根据模型 + 提示词前缀(含工具定义) + 实际发送的完整消息列表生成缓存键"""
+        # 与发给API的消息完全一致: 系统提示词、早期对话摘要、整个历史窗口和当前输入
+        messages = json.dumps(
+            self.agent._build_messages(user_input),
+            ensure_ascii=False, sort_keys=True, default=str
+        )
+        return hashlib.blake2b(
+            "\n".join([self.agent.model, self.agent.prefix_hash, messages]).encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+
+    @classmethod
+    def _get_response_db(cls) -> Optional[sqlite3.Connection]:
+        """打开(首次调用时)持久化响应缓存,未配置时返回None"""
+        if not settings.response_cache_db:
+            return None
+        with cls._response_db_lock:
+            if cls._response_db is None:
+                db_path = Path(settings.response_cache_db)
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(db_path), check_same_thread=False)
+                # 旧版表的缓存键不完整,直接丢弃
+                conn.execute("DROP TABLE IF EXISTS responses")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses_v2 ("
+                    "key TEXT PRIMARY KEY, version TEXT NOT NULL, "
+                    "response TEXT NOT NULL, created REAL NOT NULL)"
+                )
+                if settings.response_cache_ttl:
+                    conn.execute(
+                        "DELETE FROM responses_v2 WHERE created < ?",
+                        (time.time() - settings.response_cache_ttl,)
+                    )
+                conn.commit()
+                cls._response_db = conn
+            return cls._response_db
+
+    def _cache_version(self) -> str:
+        """缓存版本: 模型或系统提示词/工具定义变化后,旧的持久化条目自动失效"""
+        return hashlib.blake2b(
+            f"{self.agent.model}\n{self.agent.prefix_hash}".encode("utf-8"),
+            digest_size=8
+        ).hexdigest()
+
+    def _load_cached(self, key: str) -> Optional[AgentResponse]:
+        """依次查询L1内存缓存和L2持久化缓存"""
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+                return cached
+
+        db = self._get_response_db()
+        if db is None:
+            return None
+        ttl = settings.response_cache_ttl
+        min_created = time.time() - ttl if ttl else 0.0
+        with self._response_db_lock:
+            row = db.execute(
+                "SELECT response FROM responses_v2 WHERE key = ? AND version = ? AND created >= ?",
+                (key, self._cache_version(), min_created)
+            ).fetchone()
+        if row is None:
+            return None
+
+        cached = AgentResponse(**json.loads(row[0]))
+        self._remember(key, cached)
+        return cached
+
+    def _remember(self, key: str, result: AgentResponse):
+        """写入L1内存缓存(超出容量时淘汰最久未用的条目)"""
+        with self._response_cache_lock:
+            self._response_cache[key] = result
+            if len(self._response_cache) > self._RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _store_cached(self, key: str, result: AgentResponse):
+        """写入L1,并在配置了持久化时写入L2"""
+        self._remember(key, result)
+
+        db = self._get_response_db()
+        if db is None:
+            return
+        payload = json.dumps({
+            'success': result.success,
+            'output': result.output,
+            'reasoning_steps': result.reasoning_steps,
+            'tool_calls': result.tool_calls,
+            'metadata': result.metadata,
+            'tool_names': result.tool_names,
+        }, ensure_ascii=False)
+        with self._response_db_lock:
+            db.execute(
+                "INSERT OR REPLACE INTO responses_v2 (key, version, response, created) VALUES (?, ?, ?, ?)",
+                (key, self._cache_version(), payload, time.time())
+            )
+            db.commit()
+
+    def _cached_run(self, user_input: str, show_reasoning: bool, on_delta=None):
+        """
+        执行推理,温度为0时对相同上下文的重复提问直接复用上次的回答
+
+        Args:
+            user_input: 用户输入
+            show_reasoning: 是否显示推理过程
+            on_delta: 流式回调,提供时逐段回调回答文本
+        """
+        if self.agent.temperature != 0.0 or not self.agent.enable_cache:
+            return self._agent_run(user_input, show_reasoning, on_delta)
+
+        key = self._cache_key(user_input)
+        cached = self._load_cached(key)
+        if cached is not None:
+            # 补齐对话历史,保证后续轮次的上下文一致
+            self.agent.append_turn(user_input, cached.output)
+            if show_reasoning:
+                print(f"\n{Fore.GREEN}♻️  命中响应缓存,跳过LLM调用")
+                print(cached.output)
+            if on_delta:
+                on_delta(cached.output)
+            return cached
+
+        result = self._agent_run(user_input, show_reasoning, on_delta)
+        # 只缓存非空、且确实调用过工具并全部是纯函数工具的回答
+        # (不调用工具的闲聊回答依赖模型采样,不缓存)
+        if (result.success and result.output and result.tool_names
+                and self._CACHEABLE_TOOLS.issuperset(result.tool_names)):
+            self._store_cached(key, result)
+        return result
+
+    def _agent_run(self, user_input: str, show_reasoning: bool, on_delta=None):
+        """调用Agent推理(有流式回调时使用 run_stream)"""
+        if on_delta is None:
+            return self.agent.run(user_input, show_reasoning=show_reasoning)
+
+        for delta in self.agent.run_stream(user_input, show_reasoning=show_reasoning):
+            on_delta(delta)
+        return self.agent.last_response
+
+    def _run_and_speak(self, user_input: str, show_reasoning: bool):
+        """
+        边推理边播放: 回答每凑满一句就送入TTS队列,无需等待完整输出
+
+        Returns:
+            (AgentResponse, TTS结果字典)
+        """
+        # 断句交给TTS优化器: 代码块/列表序号等markdown结构不会被拆开单独朗读
+        self.tts_optimizer.start_stream(simulate_mode=False)  # 真实播放
+        try:
+            result = self._cached_run(user_input, show_reasoning, self.tts_optimizer.feed)
+            if result.success:
+                self.tts_optimizer.flush_stream()
+        finally:
+            tts_result = self.tts_optimizer.finish_stream()
+
+        return result, tts_result
+
     def run(self, user_input: str, show_reasoning: bool = True) -> dict:
         """
         执行推理并播放TTS
 
+        启用TTS时流式推理,首句生成后即开始合成播放
+
         Args:
             user_input: 用户输入
             show_reasoning: 是否显示推理过程
@@ -168,8 +426,15 @@ class VoiceAgent:
             self.voice_feedback.start('thinking')
 
         try:
-            # 执行推理
-            result = self.agent.run(user_input, show_reasoning=show_reasoning)
+            # 执行推理(启用TTS时同时播放)
+            tts_result = None
+            if self.enable_tts:
+                print(f"\n{Fore.CYAN}{_SEP70}")
+                print(f"{Fore.CYAN}🎵 TTS音频播放")
+                print(f"{Fore.CYAN}{_SEP70}\n")
+                result, tts_result = self._run_and_speak(user_input, show_reasoning)
+            else:
+                result = self._cached_run(user_input, show_reasoning)
 
             # 停止语音反馈
             if self.voice_mode:
@@ -182,38 +447,20 @@ class VoiceAgent:
                     'error': result.error
                 }
 
-            # TTS优化并播放
-            if self.enable_tts:
-                print(f"\n{Fore.CYAN}{'='*70}")
-                print(f"{Fore.CYAN}🎵 TTS音频播放")
-                print(f"{Fore.CYAN}{'='*70}\n")
-
-                try:
-                    tts_result = self.tts_optimizer.optimize_and_play(
-                        text=result.output,
-                        simulate_mode=False  # 真实播放
-                    )
-
-                    return {
-                        'success': True,
-                        'output': result.output,
-                        'tool_calls': result.tool_calls,
-                        'reasoning_steps': result.reasoning_steps,
-                        'should_end': result.metadata.get('should_end', False),
-                        'tts_success': tts_result.get('success', False),
-                        'tts_chunks': tts_result.get('total_chunks', 0)
-                    }
-                except Exception as e:
-                    print(f"{Fore.RED}⚠️  TTS播放失败: {e}")
+            if tts_result is not None:
+                if not tts_result.get('success', False):
                     print(f"{Fore.YELLOW}💬 文本输出: {result.output}")
 
-                    return {
-                        'success': True,
-                        'output': result.output,
-                        'tool_calls': result.tool_calls,
-                        'should_end': result.metadata.get('should_end', False),
-                        'tts_success': False
-                    }
+                return {
+                    'success': True,
+                    'output': result.output,
+                    'tool_calls': result.tool_calls,
+                    'reasoning_steps': result.reasoning_steps,
+                    'tool_names': result.tool_names,
+                    'should_end': result.metadata.get('should_end', False),
+                    'tts_success': tts_result.get('success', False),
+                    'tts_chunks': tts_result.get('total_chunks', 0)
+                }
             else:
                 # 无TTS模式
                 return {
@@ -233,6 +480,11 @@ class VoiceAgent:
                 'error': str(e)
             }
 
+    @property
+    def stats_version(self) -> int:
+        """统计版本号(对话历史变化时递增)"""
+        return self.agent.stats_version
+
     def get_stats(self):
         """获取统计信息"""
         return self.agent.get_stats()
@@ -294,9 +546,9 @@ def interactive_mode(enable_tts: bool = True):
 
             # 执行推理
             turn += 1
-            print(f"\n{Fore.MAGENTA}{'='*70}")
+            print(f"\n{Fore.MAGENTA}{_SEP70}")
             print(f"{Fore.MAGENTA}🤔 对话轮次 {turn} - Agent正在思考...")
-            print(f"{Fore.MAGENTA}{'='*70}")
+            print(f"{Fore.MAGENTA}{_SEP70}")
 
             start_time = time.time()
             result = agent.run(user_input, show_reasoning=True)
@@ -334,17 +586,39 @@ def interactive_mode(enable_tts: bool = True):
             traceback.print_exc()
 
 
-def test_mode():
-    """测试模式 - 快速测试几个示例"""
-    print("\n" + "="*80)
-    print(Fore.CYAN + Style.BRIGHT + "🧪 测试模式 - 快速验证")
-    print("="*80)
+def _print_test_result(result: dict) -> bool:
+    """打印单个测试结果,返回是否检测到对话结束"""
+    if result['success']:
+        print(f"\n{Fore.GREEN}✅ 成功")
+        print(f"   输出: {result['output'][:100]}...")
+        print(f"   工具调用: {result['tool_calls']}次")
 
-    try:
-        agent = VoiceAgent(enable_tts=True, voice_mode=False)
-    except Exception as e:
-        print(f"\n{Fore.RED}❌ Agent初始化失败: {e}")
-        return
+        if result.get('should_end'):
+            print(f"   检测到对话结束\n")
+            return True
+    else:
+        print(f"\n{Fore.RED}❌ 失败: {result['output']}\n")
+    return False
+
+
+def _print_test_header(i: int, total: int, name: str, query: str):
+    """打印测试用例标题"""
+    print(f"{Fore.YELLOW}{_DASH70}")
+    print(f"{Fore.YELLOW}测试 {i}/{total}: {name}")
+    print(f"{Fore.YELLOW}查询: {query}")
+    print(f"{Fore.YELLOW}{_DASH70}\n")
+
+
+def test_mode(parallel: bool = False):
+    """
+    测试模式 - 快速测试几个示例
+
+    Args:
+        parallel: 并发执行所有用例(每个用例独立Agent,不播放语音)
+    """
+    print("\n" + _SEP80)
+    print(Fore.CYAN + Style.BRIGHT + "🧪 测试模式 - 快速验证")
+    print(_SEP80)
 
     test_cases = [
         ("数学计算", "计算sqrt(2)保留3位小数"),
@@ -352,38 +626,68 @@ def test_mode():
         ("对话结束", "好的,再见!"),
     ]
 
+    if parallel:
+        _test_mode_parallel(test_cases)
+        return
+
+    try:
+        # 测试时只关心结果和耗时,TTS逐段计时不写终端
+        agent = VoiceAgent(enable_tts=True, voice_mode=False, verbose=False)
+    except Exception as e:
+        print(f"\n{Fore.RED}❌ Agent初始化失败: {e}")
+        return
+
     print(f"\n{Fore.CYAN}开始测试...\n")
 
     for i, (name, query) in enumerate(test_cases, 1):
-        print(f"{Fore.YELLOW}{'─'*70}")
-        print(f"{Fore.YELLOW}测试 {i}/{len(test_cases)}: {name}")
-        print(f"{Fore.YELLOW}查询: {query}")
-        print(f"{Fore.YELLOW}{'─'*70}\n")
+        _print_test_header(i, len(test_cases), name, query)
 
         result = agent.run(query, show_reasoning=False)
 
-        if result['success']:
-            print(f"\n{Fore.GREEN}✅ 成功")
-            print(f"   输出: {result['output'][:100]}...")
-            print(f"   工具调用: {result['tool_calls']}次")
-
-            if result.get('should_end'):
-                print(f"   检测到对话结束\n")
-                break
-        else:
-            print(f"\n{Fore.RED}❌ 失败: {result['output']}\n")
+        if _print_test_result(result):
+            break
 
         time.sleep(1)
 
     # 显示统计
-    print(f"\n{Fore.CYAN}{'='*70}")
+    print(f"\n{Fore.CYAN}{_SEP70}")
     print(f"{Fore.CYAN}📊 最终统计")
-    print(f"{Fore.CYAN}{'='*70}")
+    print(f"{Fore.CYAN}{_SEP70}")
     display_cache_stats(agent)
 
     print(f"{Fore.GREEN}✅ 测试完成!\n")
 
 
+def _test_mode_parallel(test_cases):
+    """
+    并发测试: 各用例互不依赖,LLM请求为IO密集,同时发出后总耗时约为最慢用例
+
+    每个用例使用独立的VoiceAgent(对话历史互不干扰),工具和TTS引擎已在进程内共享
+    """
+    try:
+        agents = [VoiceAgent(enable_tts=False, voice_mode=False) for _ in test_cases]
+    except Exception as e:
+        print(f"\n{Fore.RED}❌ Agent初始化失败: {e}")
+        return
+
+    print(f"\n{Fore.CYAN}开始并发测试({len(test_cases)}个用例)...\n")
+
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        futures = [
+            executor.submit(agent.run, query, show_reasoning=False)
+            for agent, (_, query) in zip(agents, test_cases)
+        ]
+
+        # 按用例顺序输出结果
+        for i, ((name, query), future) in enumerate(zip(test_cases, futures), 1):
+            _print_test_header(i, len(test_cases), name, query)
+            _print_test_result(future.result())
+
+    print(f"\n{Fore.GREEN}⚡ 总耗时: {Fore.WHITE}{time.time() - start_time:.2f}秒")
+    print(f"{Fore.GREEN}✅ 测试完成!\n")
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(
@@ -399,12 +703,17 @@ def main():
         action='store_true',
         help='运行测试模式'
     )
+    parser.add_argument(
+        '--parallel',
+        action='store_true',
+        help='测试模式下并发执行所有用例(不播放语音)'
+    )
 
     args = parser.parse_args()
 
     # 测试模式
     if args.test:
-        test_mode()
+        test_mode(parallel=args.parallel)
         return
 
     # 交互模式
@@ -1,206 +1,238 @@
 """
 前台接待Agent演示程序
 展示前台语音接待的实际应用场景
+
+使用方式:
+    python demo_reception.py
+    python demo_reception.py --no-pacing    # 不在轮次之间停顿(批量回放/回归测试)
+    DEMO_PACING=0.5 python demo_reception.py  # 停顿时长倍率
 """
 from agent_hybrid import HybridReasoningAgent
+import argparse
+import os
+import sys
 import time
+from types import SimpleNamespace
+
+# 尝试导入colorama(输出不是终端或设置了 NO_COLOR 时直接使用无颜色版本,不加载也不初始化colorama)
+# Linux/macOS 终端原生支持ANSI转义,只用颜色常量;仅 Windows 需要 init() 包装stdout
+# (因此不依赖 autoreset,所有彩色文本都显式以 RESET_ALL 结尾)
+HAS_COLOR = False
+if sys.stdout.isatty() and 'NO_COLOR' not in os.environ:
+    try:
+        from colorama import Fore, Style
+        if sys.platform == 'win32':
+            from colorama import init
+            init(autoreset=True)
+        HAS_COLOR = True
+    except ImportError:
+        pass
+
+if not HAS_COLOR:
+    Fore = SimpleNamespace(**dict.fromkeys(
+        ('CYAN', 'YELLOW', 'GREEN', 'MAGENTA', 'RED', 'BLUE', 'WHITE', 'LIGHTCYAN_EX', 'LIGHTYELLOW_EX'), ""
+    ))
+    Style = SimpleNamespace(BRIGHT="", RESET_ALL="")
+
+
+# 固定文本在导入时一次性拼好,输出时整段写出
+_SEP80 = "=" * 80
+_SEP70 = "=" * 70
+_DASH80 = "─" * 80
+_R = Style.RESET_ALL
+
+_THINKING = f"{Fore.LIGHTCYAN_EX}Agent 思考中...{_R}\n\n"
+_AGENT_PREFIX = f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}{_R}\n"
+_FOOTER = f"{Fore.CYAN}{_DASH80}{_R}\n\n"
+_ROLE_PREFIX = {
+    role: f"{Fore.YELLOW}{role}：{Fore.WHITE}"
+    for role in ("访客/员工", "员工", "访客", "快递员")
+}
+
+_BANNER_STR = "\n".join([
+    "",
+    _SEP80,
+    Fore.CYAN + Style.BRIGHT + "🏢 智能前台接待Agent - 演示系统" + _R,
+    _SEP80,
+    Fore.GREEN + "\n✨ 功能展示：" + _R,
+    "  1️⃣  访客登记与签到",
+    "  2️⃣  会议室预订管理",
+    "  3️⃣  员工通讯录查询",
+    "  4️⃣  办公室路线指引",
+    "  5️⃣  快递包裹管理",
+    "  6️⃣  常见问题解答",
+    "\n" + Fore.YELLOW + "🎯 特点：" + _R,
+    "  • 智能信息提取 - 从对话中自动提取关键信息",
+    "  • 多工具协同 - 一个任务调用多个工具",
+    "  • 上下文理解 - KV Cache优化的对话记忆",
+    "  • 主动服务 - 提供相关建议和指引",
+    _SEP80 + "\n",
+]) + "\n"
+
+
+def _section_header(title: str) -> str:
+    """场景标题块"""
+    return (
+        f"\n{Fore.CYAN}{_SEP80}{_R}\n"
+        f"{Fore.CYAN}{title}{_R}\n"
+        f"{Fore.CYAN}{_SEP80}{_R}\n\n"
+    )
+
+
+_HEADER_1 = _section_header("📋 场景1：访客签到流程")
+_HEADER_2 = _section_header("🏢 场景2：会议室预订")
+_HEADER_3 = _section_header("📞 场景3：员工通讯录查询")
+_HEADER_4 = _section_header("📦 场景4：快递包裹管理")
+_HEADER_5 = _section_header("❓ 场景5：常见问题解答")
+_HEADER_COMPREHENSIVE = _section_header("🎬 综合场景：完整访客接待流程") + (
+    f"{Fore.LIGHTYELLOW_EX}【场景描述】{_R}\n"
+    "一位来自ABC公司的访客到达前台，需要完成签到、\n"
+    "查找受访人、获取路线指引、了解停车信息等一系列流程。\n\n"
+)
+_HEADER_INTERACTIVE = _section_header("💬 进入交互模式") + (
+    f"{Fore.GREEN}现在您可以作为访客或员工与前台Agent对话。{_R}\n"
+    f"{Fore.GREEN}输入 'q' 或 'quit' 退出交互模式。{_R}\n\n"
+)
+_MENU_TEXT = _section_header("📋 选择演示场景") + "".join(
+    f"{Fore.GREEN}{item}{_R}\n" for item in (
+        "1. 访客登记与签到",
+        "2. 会议室预订管理",
+        "3. 员工通讯录查询",
+        "4. 快递包裹管理",
+        "5. 常见问题解答",
+        "6. 综合场景演示（推荐）",
+        "7. 交互模式（自由对话）",
+        "8. 查看缓存统计",
+        "9. 清除对话历史",
+    )
+) + f"{Fore.RED}0. 退出程序{_R}\n\n"
 
+
+# 轮次之间的停顿倍率(仅为方便人眼阅读,设为0则不停顿;无效值按1.0处理,负数按0处理)
 try:
-    from colorama import init, Fore, Style
-    init(autoreset=True)
-    HAS_COLOR = True
-except ImportError:
-    HAS_COLOR = False
-    class Fore:
-        CYAN = YELLOW = GREEN = MAGENTA = RED = BLUE = WHITE = LIGHTCYAN_EX = LIGHTYELLOW_EX = ""
-    class Style:
-        BRIGHT = RESET_ALL = ""
+    _PACING = max(0.0, float(os.environ.get("DEMO_PACING", "1.0")))
+except ValueError:
+    _PACING = 1.0
+if _PACING == float("inf"):
+    _PACING = 1.0
+
+
+def _pause(seconds: float):
+    """按倍率停顿"""
+    if _PACING:
+        time.sleep(seconds * _PACING)
+
+
+def _write(text: str):
+    """整段写出并刷新"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def _format_question(role: str, query: str) -> str:
+    """提问行 + 思考提示"""
+    return f"{_ROLE_PREFIX[role]}{query}{_R}\n{_THINKING}"
+
+
+def _format_answer(result: dict, show_tool_names: bool = False) -> str:
+    """Agent回答(逐句) + 工具调用信息"""
+    lines = [_AGENT_PREFIX]
+    lines.extend(f"  {sentence}\n" for sentence in result['sentences'])
+    if show_tool_names:
+        if result['tool_calls'] > 0:
+            lines.append(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具： {', '.join(result['tool_names'])}{_R}\n")
+    else:
+        lines.append(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具{_R}\n")
+    return "".join(lines)
+
+
+def _format_failure(result: dict, show_tool_names: bool = False) -> str:
+    """推理失败时的错误信息"""
+    return f"\n{Fore.RED}❌ 出错了：{result['output']}{_R}\n"
+
+
+# 按 not result['success'] 取格式化函数: 0 -> 成功, 1 -> 失败
+_TURN_FORMATTERS = (_format_answer, _format_failure)
 
 
 def print_banner():
     """打印欢迎横幅"""
-    print("\n" + "="*80)
-    print(Fore.CYAN + Style.BRIGHT + "🏢 智能前台接待Agent - 演示系统")
-    print("="*80)
-    print(Fore.GREEN + "\n✨ 功能展示：")
-    print("  1️⃣  访客登记与签到")
-    print("  2️⃣  会议室预订管理")
-    print("  3️⃣  员工通讯录查询")
-    print("  4️⃣  办公室路线指引")
-    print("  5️⃣  快递包裹管理")
-    print("  6️⃣  常见问题解答")
-    print("\n" + Fore.YELLOW + "🎯 特点：")
-    print("  • 智能信息提取 - 从对话中自动提取关键信息")
-    print("  • 多工具协同 - 一个任务调用多个工具")
-    print("  • 上下文理解 - KV Cache优化的对话记忆")
-    print("  • 主动服务 - 提供相关建议和指引")
-    print("="*80 + "\n")
+    _write(_BANNER_STR)
 
 
-def demo_scenario_1_visitor_registration(agent):
-    """场景1：访客登记"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}📋 场景1：访客签到流程")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    scenarios = [
-        "你好，我是来自华为公司的张伟，来找技术部的王明谈合作项目",
-        "帮我查一下王明的联系方式",
-        "技术部怎么走？",
-    ]
+def _run_scenario(agent, header: str, scenarios: list, role_fn=lambda i: "访客",
+                  show_tool_names: bool = False, pause: float = 1):
+    """
+    运行一个演示场景: 输出标题,依次提问并展示回答,最后输出分隔线
+
+    Args:
+        agent: 前台接待Agent
+        header: 预先拼好的场景标题块
+        scenarios: 按顺序提出的问题
+        role_fn: 第i轮(从1开始)提问者的身份
+        show_tool_names: 是否列出调用的工具名
+        pause: 轮次之间的停顿(秒)
+    """
+    _write(header)
     
+    run = agent.run
     for i, query in enumerate(scenarios, 1):
-        print(f"{Fore.YELLOW}访客/员工：{Fore.WHITE}{query}")
-        print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
-        
-        result = agent.run(query, show_reasoning=False)
+        _write(_format_question(role_fn(i), query))
         
-        if result['success']:
-            print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-            for sentence in result['sentences']:
-                print(f"  {sentence}")
-            print(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具")
+        result = run(query, show_reasoning=False)
         
-        print()
+        _write(_TURN_FORMATTERS[not result['success']](result, show_tool_names) + "\n")
         if i < len(scenarios):
-            time.sleep(1)
+            _pause(pause)
     
-    print(f"{Fore.CYAN}{'─'*80}\n")
+    _write(_FOOTER)
+
+
+def demo_scenario_1_visitor_registration(agent):
+    """场景1：访客登记"""
+    return _run_scenario(agent, _HEADER_1, [
+        "你好，我是来自华为公司的张伟，来找技术部的王明谈合作项目",
+        "帮我查一下王明的联系方式",
+        "技术部怎么走？",
+    ], role_fn=lambda i: "访客/员工")
 
 
 def demo_scenario_2_meeting_room(agent):
     """场景2：会议室预订"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}🏢 场景2：会议室预订")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    scenarios = [
+    return _run_scenario(agent, _HEADER_2, [
         "下午3点有空闲的会议室吗？需要10人的",
         "预订创新会议室，时间下午3点到5点，组织者是李娜",
         "创新会议室怎么走？",
-    ]
-    
-    for i, query in enumerate(scenarios, 1):
-        print(f"{Fore.YELLOW}员工：{Fore.WHITE}{query}")
-        print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
-        
-        result = agent.run(query, show_reasoning=False)
-        
-        if result['success']:
-            print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-            for sentence in result['sentences']:
-                print(f"  {sentence}")
-            print(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具")
-        
-        print()
-        if i < len(scenarios):
-            time.sleep(1)
-    
-    print(f"{Fore.CYAN}{'─'*80}\n")
+    ], role_fn=lambda i: "员工")
 
 
 def demo_scenario_3_employee_directory(agent):
     """场景3：员工查询"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}📞 场景3：员工通讯录查询")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    scenarios = [
+    return _run_scenario(agent, _HEADER_3, [
         "帮我找一下人力资源部的李娜",
         "能帮我呼叫她吗？",
-    ]
-    
-    for i, query in enumerate(scenarios, 1):
-        print(f"{Fore.YELLOW}访客：{Fore.WHITE}{query}")
-        print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
-        
-        result = agent.run(query, show_reasoning=False)
-        
-        if result['success']:
-            print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-            for sentence in result['sentences']:
-                print(f"  {sentence}")
-            print(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具")
-        
-        print()
-        if i < len(scenarios):
-            time.sleep(1)
-    
-    print(f"{Fore.CYAN}{'─'*80}\n")
+    ])
 
 
 def demo_scenario_4_package(agent):
     """场景4：快递管理"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}📦 场景4：快递包裹管理")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    scenarios = [
+    return _run_scenario(agent, _HEADER_4, [
         "有张伟的一个顺丰快递，单号SF1234567890",
         "我是张伟，查一下我的快递",
-    ]
-    
-    for i, query in enumerate(scenarios, 1):
-        role = "快递员" if i == 1 else "员工"
-        print(f"{Fore.YELLOW}{role}：{Fore.WHITE}{query}")
-        print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
-        
-        result = agent.run(query, show_reasoning=False)
-        
-        if result['success']:
-            print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-            for sentence in result['sentences']:
-                print(f"  {sentence}")
-            print(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具")
-        
-        print()
-        if i < len(scenarios):
-            time.sleep(1)
-    
-    print(f"{Fore.CYAN}{'─'*80}\n")
+    ], role_fn=lambda i: "快递员" if i == 1 else "员工")
 
 
 def demo_scenario_5_faq(agent):
     """场景5：常见问题"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}❓ 场景5：常见问题解答")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    scenarios = [
+    return _run_scenario(agent, _HEADER_5, [
         "WiFi密码是什么？",
         "停车怎么办理？",
         "公司餐厅在哪里？",
-    ]
-    
-    for i, query in enumerate(scenarios, 1):
-        print(f"{Fore.YELLOW}访客：{Fore.WHITE}{query}")
-        print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
-        
-        result = agent.run(query, show_reasoning=False)
-        
-        if result['success']:
-            print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-            for sentence in result['sentences']:
-                print(f"  {sentence}")
-            print(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具")
-        
-        print()
-        if i < len(scenarios):
-            time.sleep(1)
-    
-    print(f"{Fore.CYAN}{'─'*80}\n")
+    ])
 
 
 def demo_comprehensive_scenario(agent):
     """综合场景：完整的访客接待流程"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}🎬 综合场景：完整访客接待流程")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    print(f"{Fore.LIGHTYELLOW_EX}【场景描述】")
-    print(f"一位来自ABC公司的访客到达前台，需要完成签到、")
-    print(f"查找受访人、获取路线指引、了解停车信息等一系列流程。\n")
-    
     conversation = [
         ("访客", "你好！"),
         ("访客", "我是ABC公司的刘强，来找技术部的张伟讨论项目"),
@@ -209,112 +241,80 @@ def demo_comprehensive_scenario(agent):
         ("访客", "好的，谢谢！我可以连WiFi吗？"),
         ("访客", "太好了，谢谢你的帮助！"),
     ]
-    
-    for i, (role, query) in enumerate(conversation, 1):
-        print(f"{Fore.YELLOW}{role}：{Fore.WHITE}{query}")
-        print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
-        
-        result = agent.run(query, show_reasoning=False)
-        
-        if result['success']:
-            print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-            for sentence in result['sentences']:
-                print(f"  {sentence}")
-            
-            if result['tool_calls'] > 0:
-                print(f"\n{Fore.MAGENTA}⚙️  调用了 {result['tool_calls']} 个工具：", end="")
-                tools_used = [step['tool'] for step in result['reasoning_steps']]
-                print(f" {', '.join(tools_used)}")
-        
-        print()
-        if i < len(conversation):
-            time.sleep(1.5)
-    
-    print(f"{Fore.CYAN}{'─'*80}\n")
+    return _run_scenario(
+        agent,
+        _HEADER_COMPREHENSIVE,
+        [query for _, query in conversation],
+        role_fn=lambda i: conversation[i - 1][0],
+        show_tool_names=True,
+        pause=1.5
+    )
 
 
 def interactive_mode(agent):
     """交互模式"""
-    print(f"\n{Fore.CYAN}{'='*80}")
-    print(f"{Fore.CYAN}💬 进入交互模式")
-    print(f"{Fore.CYAN}{'='*80}\n")
-    
-    print(f"{Fore.GREEN}现在您可以作为访客或员工与前台Agent对话。")
-    print(f"{Fore.GREEN}输入 'q' 或 'quit' 退出交互模式。\n")
+    _write(_HEADER_INTERACTIVE)
     
+    run = agent.run
     turn = 0
     while True:
         try:
             user_input = input(f"{Fore.YELLOW}您：{Style.RESET_ALL}").strip()
             
             if user_input.lower() in ['q', 'quit', 'exit', '退出']:
-                print(f"\n{Fore.CYAN}返回主菜单...\n")
+                print(f"\n{Fore.CYAN}返回主菜单...{_R}\n")
                 break
             
             if not user_input:
                 continue
             
             turn += 1
-            print(f"{Fore.LIGHTCYAN_EX}Agent 思考中...\n")
+            _write(_THINKING)
             
-            result = agent.run(user_input, show_reasoning=False)
+            result = run(user_input, show_reasoning=False)
             
             if result['success']:
-                print(f"\n{Fore.GREEN}🤖 Agent：{Fore.WHITE}")
-                for sentence in result['sentences']:
-                    print(f"  {sentence}")
+                lines = [_AGENT_PREFIX]
+                lines.extend(f"  {sentence}\n" for sentence in result['sentences'])
                 
                 if result['tool_calls'] > 0:
-                    tools_used = [step['tool'] for step in result['reasoning_steps']]
-                    print(f"\n{Fore.MAGENTA}⚙️  调用工具：{', '.join(tools_used)}")
+                    lines.append(f"\n{Fore.MAGENTA}⚙️  调用工具：{', '.join(result['tool_names'])}{_R}\n")
+                _write("".join(lines))
                 
                 # 检查是否需要结束
                 if result.get('should_end'):
-                    print(f"\n{Fore.YELLOW}检测到对话结束信号，返回主菜单...\n")
+                    print(f"\n{Fore.YELLOW}检测到对话结束信号，返回主菜单...{_R}\n")
                     break
             else:
-                print(f"\n{Fore.RED}❌ 出错了：{result['output']}\n")
+                print(f"\n{Fore.RED}❌ 出错了：{result['output']}{_R}\n")
             
             print()
             
         except KeyboardInterrupt:
-            print(f"\n\n{Fore.CYAN}返回主菜单...\n")
+            print(f"\n\n{Fore.CYAN}返回主菜单...{_R}\n")
             break
         except Exception as e:
-            print(f"\n{Fore.RED}❌ 错误：{str(e)}\n")
+            print(f"\n{Fore.RED}❌ 错误：{str(e)}{_R}\n")
 
 
 def main():
     """主程序"""
     print_banner()
     
-    print(f"{Fore.CYAN}⏳ 正在初始化前台接待Agent...")
+    print(f"{Fore.CYAN}⏳ 正在初始化前台接待Agent...{_R}")
     start_time = time.time()
     agent = HybridReasoningAgent(enable_cache=True)
     init_time = time.time() - start_time
-    print(f"{Fore.GREEN}✅ 初始化完成！耗时: {init_time:.2f}秒\n")
+    print(f"{Fore.GREEN}✅ 初始化完成！耗时: {init_time:.2f}秒{_R}\n")
     
     while True:
-        print(f"\n{Fore.CYAN}{'='*80}")
-        print(f"{Fore.CYAN}📋 选择演示场景")
-        print(f"{Fore.CYAN}{'='*80}\n")
-        
-        print(f"{Fore.GREEN}1. 访客登记与签到")
-        print(f"{Fore.GREEN}2. 会议室预订管理")
-        print(f"{Fore.GREEN}3. 员工通讯录查询")
-        print(f"{Fore.GREEN}4. 快递包裹管理")
-        print(f"{Fore.GREEN}5. 常见问题解答")
-        print(f"{Fore.GREEN}6. 综合场景演示（推荐）")
-        print(f"{Fore.GREEN}7. 交互模式（自由对话）")
-        print(f"{Fore.GREEN}8. 查看缓存统计")
-        print(f"{Fore.GREEN}9. 清除对话历史")
-        print(f"{Fore.RED}0. 退出程序\n")
+        _write(_MENU_TEXT)
         
         try:
             choice = input(f"{Fore.YELLOW}请选择 (0-9)：{Style.RESET_ALL}").strip()
             
             if choice == '0':
-                print(f"\n{Fore.YELLOW}👋 感谢使用！再见！\n")
+                print(f"\n{Fore.YELLOW}👋 感谢使用！再见！{_R}\n")
                 break
             elif choice == '1':
                 demo_scenario_1_visitor_registration(agent)
@@ -332,29 +332,39 @@ def main():
                 interactive_mode(agent)
             elif choice == '8':
                 stats = agent.get_cache_stats()
-                print(f"\n{Fore.CYAN}{'='*70}")
-                print(f"{Fore.CYAN}📊 KV Cache 统计")
-                print(f"{Fore.CYAN}{'='*70}")
-                print(f"{Fore.GREEN}对话轮次：{stats['conversation_turns']}")
-                print(f"{Fore.GREEN}缓存tokens：~{stats['estimated_cached_tokens']} tokens")
-                print(f"{Fore.GREEN}系统提示词：~{stats['system_prompt_tokens']} tokens (已缓存)")
+                lines = [
+                    f"\n{Fore.CYAN}{_SEP70}{_R}",
+                    f"{Fore.CYAN}📊 KV Cache 统计{_R}",
+                    f"{Fore.CYAN}{_SEP70}{_R}",
+                    f"{Fore.GREEN}对话轮次：{stats['conversation_turns']}{_R}",
+                    f"{Fore.GREEN}缓存tokens：~{stats['estimated_cached_tokens']} tokens{_R}",
+                    f"{Fore.GREEN}系统提示词：~{stats['system_prompt_tokens']} tokens (已缓存){_R}",
+                ]
                 if stats['conversation_turns'] > 0:
                     saved = int(stats['estimated_cached_tokens'] * 0.5)
-                    print(f"{Fore.YELLOW}💰 预估节省：~{saved} tokens")
-                print(f"{Fore.CYAN}{'='*70}\n")
+                    lines.append(f"{Fore.YELLOW}💰 预估节省：~{saved} tokens{_R}")
+                lines.append(f"{Fore.CYAN}{_SEP70}{_R}\n\n")
+                _write("\n".join(lines))
             elif choice == '9':
                 agent.clear_cache()
-                print(f"\n{Fore.GREEN}✅ 对话历史已清除\n")
+                print(f"\n{Fore.GREEN}✅ 对话历史已清除{_R}\n")
             else:
-                print(f"\n{Fore.RED}❌ 无效选择，请重新输入\n")
+                print(f"\n{Fore.RED}❌ 无效选择，请重新输入{_R}\n")
                 
         except KeyboardInterrupt:
-            print(f"\n\n{Fore.YELLOW}👋 程序被中断，再见！\n")
+            print(f"\n\n{Fore.YELLOW}👋 程序被中断，再见！{_R}\n")
             break
         except Exception as e:
-            print(f"\n{Fore.RED}❌ 发生错误：{str(e)}\n")
+            print(f"\n{Fore.RED}❌ 发生错误：{str(e)}{_R}\n")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="前台接待Agent演示程序")
+    parser.add_argument('--no-pacing', action='store_true', help='轮次之间不停顿')
+    args = parser.parse_args()
+
+    if args.no_pacing:
+        _PACING = 0.0
+
     main()
 
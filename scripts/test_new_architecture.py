@@ -4,7 +4,9 @@
 使用方式:
     python scripts/test_new_architecture.py
 """
+import os
 import sys
+import traceback
 from pathlib import Path
 
 # 添加src目录到路径
@@ -34,7 +36,6 @@ def test_imports():
         return True
     except Exception as e:
         print(f"❌ 导入失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -62,7 +63,6 @@ def test_config():
         return True
     except Exception as e:
         print(f"❌ 配置测试失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -89,7 +89,6 @@ def test_tools():
         return True
     except Exception as e:
         print(f"❌ 工具加载失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -125,7 +124,6 @@ def test_agent_creation():
         return True
     except Exception as e:
         print(f"❌ Agent创建失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -175,7 +173,6 @@ def test_tool_registry():
         return True
     except Exception as e:
         print(f"❌ 工具注册表测试失败: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -202,10 +199,21 @@ def test_directory_structure():
         "config",
     ]
 
+    # 每个父目录只列举一次,之后按集合查找(不再对每个目录单独 stat)
+    existing = set()
+    for parent in {dir_path.rpartition("/")[0] for dir_path in required_dirs}:
+        try:
+            with os.scandir(project_root / parent) as entries:
+                existing.update(
+                    f"{parent}/{entry.name}" if parent else entry.name
+                    for entry in entries if entry.is_dir()
+                )
+        except FileNotFoundError:
+            pass
+
     missing = []
     for dir_path in required_dirs:
-        full_path = project_root / dir_path
-        if full_path.exists():
+        if dir_path in existing:
             print(f"✅ {dir_path}")
         else:
             print(f"❌ {dir_path} (不存在)")
@@ -272,5 +280,4 @@ if __name__ == "__main__":
         print("\n\n👋 测试被中断\n")
     except Exception as e:
         print(f"\n❌ 测试失败: {e}\n")
-        import traceback
         traceback.print_exc()
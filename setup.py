@@ -12,11 +12,11 @@ long_description = readme_path.read_text(encoding="utf-8") if readme_path.exists
 requirements_path = Path(__file__).parent / "requirements.txt"
 requirements = []
 if requirements_path.exists():
-    requirements = [
-        line.strip()
-        for line in requirements_path.read_text(encoding="utf-8").splitlines()
-        if line.strip() and not line.startswith("#")
-    ]
+    with requirements_path.open(encoding="utf-8") as f:
+        requirements = [
+            line for line in (raw.strip() for raw in f)
+            if line and line[0] != "#"
+        ]
 
 setup(
     name="robot_agent_mindflow",
@@ -29,6 +29,13 @@ setup(
     url="https://github.com/Lloyd-lei/robot_agent_mindflow",
     packages=find_packages(include=["src", "src.*"]),
     install_requires=requirements,
+    # 可选加速依赖: pip install -e ".[fast]"
+    extras_require={
+        "fast": [
+            "orjson>=3.9.0",    # 更快的JSON解析(未安装时回退到标准库json)
+            "tiktoken>=0.5.0",  # 按模型分词器计数token(未安装时按字符数估算)
+        ],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -1,5 +1,5 @@
 """Core 核心模块"""
-from src.core.agents import BaseAgent, AgentResponse, HybridReasoningAgent
+from src.core.agents import BaseAgent, AgentResponse
 from src.core.tools import BaseTool, ToolMetadata, tool_registry
 from src.core.config import settings
 
@@ -12,3 +12,11 @@ __all__ = [
     'tool_registry',
     'settings',
 ]
+
+
+def __getattr__(name):
+    # HybridReasoningAgent 按需导入(见 src.core.agents)
+    if name == 'HybridReasoningAgent':
+        from src.core.agents import HybridReasoningAgent
+        return HybridReasoningAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,15 @@
 """Core Agent模块"""
 from src.core.agents.base import BaseAgent, AgentResponse
-from src.core.agents.hybrid_agent import HybridReasoningAgent
 
-__all__ = ['BaseAgent', 'AgentResponse', 'HybridReasoningAgent']
+__all__ = ['BaseAgent', 'AgentResponse', 'HybridReasoningAgent', 'CompilerAgent']
+
+
+def __getattr__(name):
+    # HybridReasoningAgent 依赖 openai,首次访问时才导入,只用 BaseAgent/AgentResponse 时不加载
+    if name == 'HybridReasoningAgent':
+        from src.core.agents.hybrid_agent import HybridReasoningAgent
+        return HybridReasoningAgent
+    if name == 'CompilerAgent':
+        from src.core.agents.compiler_agent import CompilerAgent
+        return CompilerAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,52 @@
 """
 Agent 抽象基类 - 定义统一的 Agent 接口
 """
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
-
-
-@dataclass
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+# tiktoken 可选: 安装后按模型分词器计数,未安装时按约4字符1个token估算
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Python 3.10+ 的 dataclass 支持 slots(实例不带 __dict__,更省内存,属性访问更快)
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=None)
+def _encoding_for(model: str):
+    """获取模型对应的分词器(按模型缓存),tiktoken不可用时返回None"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # 未知模型使用通用编码
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        # 编码文件下载失败等情况,回退到字符估算
+        return None
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class AgentResponse:
     """Agent 响应结果"""
     success: bool
     output: str
-    reasoning_steps: List[Dict] = None
+    reasoning_steps: List[Dict] = field(default_factory=list)
     tool_calls: int = 0
-    metadata: Dict[str, Any] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
     error: Optional[str] = None
-
-    def __post_init__(self):
-        if self.reasoning_steps is None:
-            self.reasoning_steps = []
-        if self.metadata is None:
-            self.metadata = {}
+    # 按调用顺序的工具名(与 reasoning_steps 一一对应,生成结果时一次算好)
+    tool_names: List[str] = field(default_factory=list)
 
 
 class BaseAgent(ABC):
@@ -32,9 +58,32 @@ class BaseAgent(ABC):
     - clear_history(): 清除历史
     """
 
-    def __init__(self, name: str = "BaseAgent"):
+    # 最多保留的早期对话摘要条数
+    MAX_MEMORY_SUMMARIES = 32
+
+    # token计数用的分词器(子类按模型设置,None时按字符估算)
+    _encoding = None
+
+    def __init__(self, name: str = "BaseAgent", max_turns: Optional[int] = None):
+        """
+        Args:
+            name: Agent名称
+            max_turns: 对话历史最多保留的轮次(None表示不限制)
+        """
         self.name = name
-        self.conversation_history = []
+        self.max_turns = max_turns
+        # 环形缓冲(滑动窗口): 超出 max_turns 的最早轮次移出窗口
+        self.conversation_history = deque(maxlen=2 * max_turns if max_turns else None)
+        # 移出窗口的轮次压缩成一行摘要保留下来,窗口外的上下文不至于完全丢失
+        self.memory_summaries = deque(maxlen=self.MAX_MEMORY_SUMMARIES)
+        # 累计用户轮次(增量维护,统计时无需遍历历史)
+        self.user_turns = 0
+        # 窗口内历史的估算token数(增量维护,同上)
+        self.cached_tokens = 0
+        # 统计版本号: 对话历史每次变化时递增,用于判断统计缓存是否失效
+        self.stats_version = 0
+        # 只读历史快照: (stats_version, 历史元组)
+        self._history_view: Optional[Tuple[int, Tuple[Dict, ...]]] = None
 
     @abstractmethod
     def run(self, user_input: str, **kwargs) -> AgentResponse:
@@ -55,9 +104,60 @@ class BaseAgent(ABC):
         """清除对话历史"""
         pass
 
-    def get_history(self) -> List[Dict]:
-        """获取对话历史"""
-        return self.conversation_history.copy()
+    def append_turn(self, user_input: str, output: str) -> None:
+        """
+        记录一轮对话到历史
+
+        Args:
+            user_input: 用户输入
+            output: Agent回答(模型可能返回None,按空字符串记录)
+        """
+        output = output or ""
+        history = self.conversation_history
+        if history.maxlen is not None and len(history) >= history.maxlen:
+            # 窗口已满: 最早的一问一答即将被挤出,先压缩成摘要
+            self.memory_summaries.append(self._summarize_turn(history[0], history[1]))
+            self.cached_tokens -= (
+                self.estimate_tokens(history[0]['content']) + self.estimate_tokens(history[1]['content'])
+            )
+
+        history.append({"role": "user", "content": user_input})
+        history.append({"role": "assistant", "content": output})
+        self.cached_tokens += self.estimate_tokens(user_input) + self.estimate_tokens(output)
+        self.user_turns += 1
+        self.stats_version += 1
+
+    def estimate_tokens(self, text: str) -> int:
+        """估算token数(有分词器时精确计数,否则约4字符1个token)"""
+        if not text:
+            return 0
+        encoding = self._encoding
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return len(text) // 4
+
+    @staticmethod
+    def _summarize_turn(user_msg: Dict, assistant_msg: Dict) -> str:
+        """把一轮对话压缩成一行摘要(截断,不调用LLM)"""
+        question = (user_msg['content'] or "").replace("\n", " ")[:50]
+        answer = (assistant_msg['content'] or "").replace("\n", " ")[:80]
+        return f"用户: {question} → 助手: {answer}"
+
+    def get_history(self) -> Tuple[Dict, ...]:
+        """
+        获取对话历史(只读快照)
+
+        历史未变化时重复调用返回同一个元组,不再复制;需要修改时请用 copy_history()
+        """
+        view = self._history_view
+        if view is None or view[0] != self.stats_version:
+            view = (self.stats_version, tuple(self.conversation_history))
+            self._history_view = view
+        return view[1]
+
+    def copy_history(self) -> List[Dict]:
+        """获取对话历史的可修改副本"""
+        return list(self.conversation_history)
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -68,7 +168,7 @@ class BaseAgent(ABC):
         """
         return {
             'agent_name': self.name,
-            'conversation_turns': len(self.conversation_history) // 2,
+            'conversation_turns': self.user_turns,
             'total_messages': len(self.conversation_history)
         }
 
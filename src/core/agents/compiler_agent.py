@@ -0,0 +1,395 @@
+"""
+LLMCompiler 风格 Agent - 先规划出带依赖关系的工具调用图,再按依赖并发执行
+
+与 HybridReasoningAgent 的区别:
+1. 第一次LLM调用输出完整的执行计划(JSON),而不是一批工具调用
+2. 计划中相互依赖的工具调用也在同一轮内执行,不再为每一步多一次LLM往返
+3. 依赖已满足的任务立即提交到线程池,互不依赖的任务并发执行
+4. 最后一次LLM调用(Joiner)汇总所有结果生成回答
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import re
+
+from src.core.agents.base import AgentResponse
+from src.core.agents.hybrid_agent import HybridReasoningAgent, _json_loads
+from src.core.config import settings
+from src.core.tools.base import BaseTool
+
+
+# 参数中的结果占位符: "$1" 或 "${1}" 表示任务1的执行结果
+_PLACEHOLDER_RE = re.compile(r"\$\{?(\w+)\}?")
+
+# JSON Schema 基本类型 -> Python类型(校验计划参数用)
+_JSON_TYPES = {
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+
+class PlanError(ValueError):
+    """执行计划不合法(缺少字段、未知工具、参数不符合schema等)"""
+
+
+def validate_plan(raw_tasks: Any, schemas: Dict[str, Dict]) -> List[Dict]:
+    """
+    校验并规范化Planner输出的任务列表
+
+    Args:
+        raw_tasks: 模型输出的 tasks 字段
+        schemas: 工具名 -> 参数JSON Schema
+
+    Returns:
+        [{"id", "tool", "args", "deps"}],id/deps 统一为字符串;
+        args 中 $id 占位符引用的任务会自动补进 deps,保证先执行完再替换
+
+    Raises:
+        PlanError: 计划不合法
+    """
+    if not isinstance(raw_tasks, list):
+        raise PlanError("tasks 必须是列表")
+
+    tasks = []
+    seen = set()
+    for index, task in enumerate(raw_tasks, 1):
+        if not isinstance(task, dict) or "id" not in task or "tool" not in task:
+            raise PlanError(f"第{index}个任务缺少 id 或 tool")
+
+        task_id = str(task["id"])
+        if task_id in seen:
+            raise PlanError(f"任务id重复: {task_id}")
+        seen.add(task_id)
+
+        tool = task["tool"]
+        if tool not in schemas:
+            raise PlanError(f"任务{task_id}使用了未知工具: {tool}")
+
+        args = task.get("args") or {}
+        deps = task.get("deps") or []
+        if not isinstance(args, dict) or not isinstance(deps, list):
+            raise PlanError(f"任务{task_id}的 args 必须是对象、deps 必须是列表")
+        _check_args(task_id, args, schemas[tool])
+
+        tasks.append({
+            "id": task_id,
+            "tool": tool,
+            "args": args,
+            "deps": [str(dep) for dep in deps]
+        })
+
+    for task in tasks:
+        _check_refs(task, seen)
+    return tasks
+
+
+def _check_refs(task: Dict, task_ids: set) -> None:
+    """检查依赖和占位符引用的任务都存在,并把占位符引用补进 deps"""
+    refs = _placeholder_refs(task["args"])
+    for ref in task["deps"] + refs:
+        if ref not in task_ids:
+            raise PlanError(f"任务{task['id']}引用了不存在的任务: {ref}")
+        if ref == task["id"]:
+            raise PlanError(f"任务{task['id']}不能依赖自身")
+    for ref in refs:
+        if ref not in task["deps"]:
+            task["deps"].append(ref)
+
+
+def _placeholder_refs(value: Any) -> List[str]:
+    """收集参数中 $id 占位符引用的任务id"""
+    if isinstance(value, str):
+        return _PLACEHOLDER_RE.findall(value)
+    if isinstance(value, dict):
+        return [ref for v in value.values() for ref in _placeholder_refs(v)]
+    if isinstance(value, list):
+        return [ref for v in value for ref in _placeholder_refs(v)]
+    return []
+
+
+def _check_args(task_id: str, args: Dict, schema: Dict) -> None:
+    """按工具的参数schema检查必填参数、未知参数和基本类型"""
+    properties = schema.get("properties") or {}
+
+    missing = [name for name in schema.get("required") or [] if name not in args]
+    if missing:
+        raise PlanError(f"任务{task_id}缺少参数: {', '.join(missing)}")
+
+    unknown = [name for name in args if name not in properties]
+    if unknown:
+        raise PlanError(f"任务{task_id}包含未知参数: {', '.join(unknown)}")
+
+    for name, value in args.items():
+        json_type = properties[name].get("type")
+        expected = _JSON_TYPES.get(json_type)
+        if expected is None:
+            continue
+        # 占位符在执行时才替换为依赖任务的结果
+        if isinstance(value, str) and _PLACEHOLDER_RE.search(value):
+            continue
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            raise PlanError(f"任务{task_id}的参数 {name} 应为 {json_type}")
+
+
+class TaskFetchingUnit:
+    """
+    任务调度单元
+
+    按依赖关系调度计划中的任务: 依赖全部完成的任务立即提交到线程池,
+    其参数中的 $id 占位符替换为对应任务的结果
+    """
+
+    def __init__(self, pool, execute: Callable[[str, Dict], str], timeout: float):
+        """
+        Args:
+            pool: 执行工具的线程池
+            execute: 工具执行函数 (工具名, 参数) -> 结果
+            timeout: 等待任意一个任务完成的最长时间(秒)
+        """
+        self.pool = pool
+        self.execute = execute
+        self.timeout = timeout
+
+    def run(self, tasks: List[Dict]) -> Dict[str, str]:
+        """
+        执行计划
+
+        Args:
+            tasks: [{"id", "tool", "args", "deps"}],执行时会写入 resolved_args
+
+        Returns:
+            任务id -> 执行结果
+        """
+        results: Dict[str, str] = {}
+        pending = {task["id"]: task for task in tasks}
+        running = {}
+
+        while pending or running:
+            ready = [
+                task_id for task_id, task in pending.items()
+                if all(dep in results for dep in task["deps"])
+            ]
+            for task_id in ready:
+                task = pending.pop(task_id)
+                task["resolved_args"] = self._substitute(task["args"], results)
+                future = self.pool.submit(self.execute, task["tool"], task["resolved_args"])
+                running[future] = task_id
+
+            if not running:
+                # 剩下的任务依赖不存在或成环,无法执行
+                for task_id, task in pending.items():
+                    task["resolved_args"] = task["args"]
+                    results[task_id] = "工具执行错误: 依赖无法满足"
+                break
+
+            done, _ = wait(running, timeout=self.timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                for task_id in running.values():
+                    results[task_id] = f"工具执行错误: 超时({self.timeout}秒)"
+                running.clear()
+                continue
+
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+        return results
+
+    @classmethod
+    def _substitute(cls, value: Any, results: Dict[str, str]) -> Any:
+        """把参数中的 $id 占位符替换为已完成任务的结果"""
+        if isinstance(value, str):
+            return _PLACEHOLDER_RE.sub(
+                lambda m: results.get(m.group(1), m.group(0)), value
+            )
+        if isinstance(value, dict):
+            return {k: cls._substitute(v, results) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._substitute(v, results) for v in value]
+        return value
+
+
+class CompilerAgent(HybridReasoningAgent):
+    """
+    LLMCompiler 风格推理Agent
+
+    流程: Planner(一次LLM调用) → TaskFetchingUnit(并发执行工具) → Joiner(一次LLM调用)
+    无需工具的问题由Planner直接回答,只调用一次LLM
+    """
+
+    _PLANNER_INSTRUCTIONS = """请为用户的问题制定工具调用计划,只输出JSON对象:
+{"tasks": [{"id": 1, "tool": "工具名", "args": {参数}, "deps": [依赖的任务id]}], "answer": ""}
+
+规则:
+1. 互不依赖的任务 deps 为空,它们会被并发执行
+2. 需要用到其他任务结果时,在 args 中写 "$任务id" 作为占位符,并把该任务id写进 deps
+3. 不需要任何工具时 tasks 为空列表,把回答直接写在 answer 中"""
+
+    # 推理过程的固定标题(预先拼好,每段一次 print 输出;回退到父类 run 时显示父类标题)
+    _COMPILER_HEADER = f"\n{'='*70}\n🧠 LLMCompiler推理过程(规划 → 并发执行 → 汇总)\n{'='*70}"
+    _PLANNING_BANNER = f"\n{'─'*70}\n📋 调用OpenAI API制定执行计划...\n{'─'*70}"
+    _JOINING_BANNER = f"\n{'─'*70}\n💭 汇总所有任务结果生成最终回答...\n{'─'*70}"
+
+    # 明确告别时追加到规划指令(用户消息保持原样)
+    _END_INSTRUCTION = "\n4. 用户在告别,计划中必须包含end_conversation_detector"
+
+    def __init__(
+        self,
+        tools: List[BaseTool],
+        name: str = "CompilerAgent",
+        **kwargs
+    ):
+        """
+        初始化LLMCompiler风格Agent
+
+        Args:
+            tools: 工具列表
+            name: Agent名称
+            **kwargs: 其他参数同 HybridReasoningAgent
+        """
+        super().__init__(tools=tools, name=name, **kwargs)
+
+        # 工具参数schema: 写进规划指令供模型生成参数,并用于校验计划
+        self.tool_schemas = {
+            tool["function"]["name"]: tool["function"]["parameters"]
+            for tool in self.openai_tools
+        }
+        self._tools_instruction = "\n\n可用工具及参数(JSON Schema,args 必须符合):\n" + "\n".join(
+            f"- {tool_name}: {json.dumps(schema, ensure_ascii=False)}"
+            for tool_name, schema in self.tool_schemas.items()
+        )
+        self.task_fetching_unit = TaskFetchingUnit(
+            self._tool_pool, self._execute_tool, settings.timeout
+        )
+
+    def run(
+        self,
+        user_input: str,
+        show_reasoning: bool = True
+    ) -> AgentResponse:
+        """
+        执行推理: 规划 → 并发执行 → 汇总
+
+        Args:
+            user_input: 用户输入
+            show_reasoning: 是否显示推理过程
+
+        Returns:
+            AgentResponse: 执行结果
+        """
+        if show_reasoning:
+            print(self._COMPILER_HEADER)
+
+        end_note = self._end_note(user_input)
+        if end_note and show_reasoning:
+            print(end_note)
+
+        messages = self._build_messages(user_input)
+        reasoning_steps = []
+
+        try:
+            if show_reasoning:
+                print(self._PLANNING_BANNER)
+
+            try:
+                tasks, answer = self._plan(messages, self._is_farewell(user_input))
+            except PlanError as e:
+                # 计划不合法时不执行任何工具,改用原生Function Calling(由API按schema约束参数)
+                if show_reasoning:
+                    print(f"\n⚠️  执行计划无效({e}),改用原生Function Calling")
+                return super().run(user_input, show_reasoning)
+
+            if tasks:
+                if show_reasoning:
+                    print(f"\n✅ 计划包含{len(tasks)}个任务")
+
+                results = self.task_fetching_unit.run(tasks)
+
+                for step, task in enumerate(tasks, 1):
+                    result = results[task["id"]]
+                    if show_reasoning:
+                        self._display_tool_call(step, task["tool"], task["resolved_args"])
+                        self._display_tool_result(result)
+                    reasoning_steps.append({
+                        'step': step,
+                        'tool': task["tool"],
+                        'arguments': task["resolved_args"],
+                        'result': result
+                    })
+
+                if show_reasoning:
+                    print(self._JOINING_BANNER)
+
+                final_answer = self._join(messages, reasoning_steps)
+            else:
+                if show_reasoning:
+                    print("\n⚠️  计划不需要工具,直接回答")
+                final_answer = answer
+
+            return self._finish_turn(
+                user_input, final_answer, reasoning_steps, len(reasoning_steps), show_reasoning
+            )
+
+        except Exception as e:
+            return self._error_response(e)
+
+    def _plan(self, messages: List[Dict], force_end_detection: bool = False) -> Tuple[List[Dict], str]:
+        """
+        Planner: 让模型输出执行计划
+
+        Args:
+            messages: 当前请求的消息列表
+            force_end_detection: 是否要求计划包含end_conversation_detector
+
+        Returns:
+            (规范化后的任务列表, 无需工具时的直接回答)
+
+        Raises:
+            PlanError: 模型输出的计划不合法
+        """
+        instructions = self._PLANNER_INSTRUCTIONS
+        if force_end_detection:
+            instructions += self._END_INSTRUCTION
+        instructions += self._tools_instruction
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages + [{"role": "system", "content": instructions}],
+            response_format={"type": "json_object"},
+            temperature=self.temperature,
+            extra_body=self._extra_body
+        )
+        try:
+            plan = _json_loads(response.choices[0].message.content or "{}")
+        except ValueError as e:
+            raise PlanError(f"计划不是合法JSON: {e}") from e
+        if not isinstance(plan, dict):
+            raise PlanError("计划必须是JSON对象")
+
+        tasks = validate_plan(plan.get("tasks") or [], self.tool_schemas)
+        return tasks, plan.get("answer") or ""
+
+    def _join(self, messages: List[Dict], reasoning_steps: List[Dict]) -> Optional[str]:
+        """Joiner: 基于所有任务结果生成最终回答"""
+        results_text = "\n".join(
+            f"[{step['step']}] {step['tool']}"
+            f"({json.dumps(step['arguments'], ensure_ascii=False)}) → {step['result']}"
+            for step in reasoning_steps
+        )
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages + [{
+                "role": "system",
+                "content": f"已按计划执行以下工具,请基于结果直接回答用户:\n{results_text}"
+            }],
+            temperature=self.temperature,
+            extra_body=self._extra_body
+        )
+        return response.choices[0].message.content
+
+
+# 导出
+__all__ = ['CompilerAgent', 'TaskFetchingUnit', 'PlanError', 'validate_plan']
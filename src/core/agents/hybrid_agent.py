@@ -8,15 +8,109 @@
 4. 100%可靠的工具调用
 5. 完整的推理过程展示
 """
-from openai import OpenAI
-from typing import List, Dict, Any, Optional
+from openai import AsyncOpenAI, OpenAI
+import httpx
+from typing import List, Dict, Any, Optional, Tuple, Iterator
+import asyncio
+import hashlib
+import importlib.util
 import json
+import re
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
+from functools import lru_cache
 
-from src.core.agents.base import BaseAgent, AgentResponse
+from src.core.agents.base import BaseAgent, AgentResponse, _encoding_for
 from src.core.config import settings
 from src.core.tools.base import BaseTool
 
+# orjson 可选: 解析工具参数更快,未安装时回退到标准库 json
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+
+# HTTP/2 需要可选依赖 h2,未安装时使用 HTTP/1.1 长连接
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+@lru_cache(maxsize=None)
+def _shared_client(api_key: str) -> OpenAI:
+    """进程内共享的OpenAI客户端(按API密钥缓存),所有Agent复用同一个连接池"""
+    return OpenAI(
+        api_key=api_key,
+        timeout=settings.timeout,
+        max_retries=settings.max_retries,
+        http_client=httpx.Client(http2=_HTTP2, limits=_HTTP_LIMITS)
+    )
+
+
+# 异步客户端的连接池绑定创建时的事件循环,按 事件循环 -> API密钥 分别缓存
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+_async_clients_lock = threading.Lock()
+
+
+def _loop_async_client(api_key: str) -> AsyncOpenAI:
+    """
+    当前事件循环内共享的AsyncOpenAI客户端(需在协程中调用)
+
+    每个事件循环使用独立的连接池,多次 asyncio.run() 不会复用已关闭循环上的连接
+    """
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        # 已关闭循环上的连接不可再用,丢弃对应客户端
+        for closed in [l for l in _async_clients if l.is_closed()]:
+            del _async_clients[closed]
+
+        clients = _async_clients.setdefault(loop, {})
+        if api_key not in clients:
+            clients[api_key] = AsyncOpenAI(
+                api_key=api_key,
+                timeout=settings.timeout,
+                max_retries=settings.max_retries,
+                http_client=httpx.AsyncClient(http2=_HTTP2, limits=_HTTP_LIMITS)
+            )
+        return clients[api_key]
+
+
+@lru_cache(maxsize=None)
+def _schema_parameters(args_schema) -> Dict:
+    """工具参数schema(按参数模型类缓存,相同工具类只调用一次 model_json_schema)"""
+    # 使用model_json_schema替代deprecated的schema方法
+    return args_schema.model_json_schema()
+
+
+@lru_cache(maxsize=None)
+def _openai_tool(name: str, description: str, args_schema) -> Dict:
+    """
+    单个工具的OpenAI Function Calling格式(按 名称/描述/参数模型类 缓存)
+
+    返回的字典在所有Agent间共享,不要原地修改
+    """
+    if args_schema:
+        parameters = _schema_parameters(args_schema)
+    else:
+        parameters = {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": parameters
+        }
+    }
+
 
 class HybridReasoningAgent(BaseAgent):
     """
@@ -28,6 +122,44 @@ class HybridReasoningAgent(BaseAgent):
     - KV Cache: 性能优化(对话历史、系统提示词自动缓存)
     """
 
+    # 结束关键词: 预编译成一个忽略大小写的正则,一次扫描完成匹配
+    _END_RE = re.compile("|".join(map(re.escape, [
+        '再见', '拜拜', 'bye', 'goodbye', '退出', '结束',
+        '关闭', '离开', '不聊了', '走了', 'quit', 'exit',
+        '886', '88', '下线', '断开'
+    ])), re.IGNORECASE)
+
+    # 整句只是告别语(可带"好的""谢谢"等客套词和标点)时才算明确要结束对话
+    # 结束关键词只是出现在句中(如"计算 188*2""会议几点结束?")时不强制,其他工具照常可用
+    _FAREWELL_RE = re.compile(
+        r"^(?:(?:好的?|好吧|嗯|行|ok|okay|谢谢(?:你|您)?|谢了|那就?|我)[\s\W_]*)*"
+        r"(?:再见|拜拜|bye(?:[\s-]*bye)?|goodbye|886|88|退出|quit|exit|不聊了|走了|下线了?|结束(?:对话|吧)?)"
+        r"(?:[\s\W_]*(?:再见|拜拜|bye|goodbye|88|啦|了|吧|哦|喽))*[\s\W_]*$",
+        re.IGNORECASE
+    )
+
+    # 明确告别时使用的 tool_choice(服务端强制调用,不改动提示词)
+    _END_TOOL_CHOICE = {"type": "function", "function": {"name": "end_conversation_detector"}}
+
+    # 句中出现结束关键词但不是明确告别时,附在用户消息后的提示(所有工具仍可选)
+    _END_HINT = (
+        "[系统提示: 用户输入包含可能表示结束对话的词语。仅当用户确实想结束对话时调用"
+        "end_conversation_detector,其他需求照常使用对应工具]"
+    )
+    _END_FORCED_NOTE = "\n🔍 预处理: 检测到告别语,将强制调用end_conversation_detector"
+    _END_HINT_NOTE = "\n🔍 预处理: 检测到结束关键词,提示模型判断是否结束对话"
+
+    # 推理过程的固定标题(预先拼好,每段一次 print 输出)
+    _REASONING_HEADER = f"\n{'='*70}\n🧠 混合架构推理过程(OpenAI原生 + LangChain工具)\n{'='*70}"
+    _CALLING_BANNER = f"\n{'─'*70}\n📡 调用OpenAI API进行推理...\n{'─'*70}"
+    _ANSWERING_BANNER = f"\n{'─'*70}\n💭 模型基于工具结果生成最终回答...\n{'─'*70}"
+    _TOOLS_DECIDED = "\n✅ 模型决定调用工具(共{}个)"
+    _DIRECT_ANSWER_NOTE = "\n⚠️  模型选择直接回答(未调用工具)"
+
+    # 进程级前缀缓存: (Agent类, 模型, 工具签名(名称/描述/参数模型)) -> (系统提示词, OpenAI工具格式, 前缀哈希)
+    # 同一进程内重复创建相同配置的Agent时,直接复用已生成的系统提示词和工具schema
+    _PREFIX_CACHE: Dict[Tuple, Tuple[str, Tuple[Dict, ...], str]] = {}
+
     def __init__(
         self,
         tools: List[BaseTool],
@@ -35,7 +167,9 @@ class HybridReasoningAgent(BaseAgent):
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         enable_cache: bool = True,
-        name: str = "HybridAgent"
+        name: str = "HybridAgent",
+        max_turns: Optional[int] = None,
+        prompt_cache_key: Optional[str] = None
     ):
         """
         初始化混合架构Agent
@@ -47,25 +181,47 @@ class HybridReasoningAgent(BaseAgent):
             temperature: 温度参数(默认从配置读取)
             enable_cache: 是否启用对话历史缓存(KV Cache优化)
             name: Agent名称
+            max_turns: 对话历史最多保留的轮次(默认从配置读取,0表示不限制)
+            prompt_cache_key: OpenAI前缀缓存路由键(默认使用前缀哈希)
         """
-        super().__init__(name=name)
+        if max_turns is None:
+            max_turns = settings.history_max_turns
+        super().__init__(name=name, max_turns=max_turns or None)
 
         # 配置
         self.api_key = api_key or settings.openai_api_key
         self.model = model or settings.llm_model
         self.temperature = temperature if temperature is not None else settings.temperature
         self.enable_cache = enable_cache
+        # 按模型选择分词器,对话token数按实际分词计数(中文不再被低估)
+        self._encoding = _encoding_for(self.model)
 
-        # OpenAI客户端
-        self.client = OpenAI(api_key=self.api_key)
+        # OpenAI客户端(同一API密钥的Agent共享连接池,复用TLS连接)
+        self.client = _shared_client(self.api_key)
 
         # 工具管理
         self.tools = tools
-        self.openai_tools = self._convert_tools_to_openai_format()
         self.tool_map = {tool.name: tool for tool in tools}
 
-        # 系统提示词(会被KV Cache缓存,节省成本)
-        self.system_prompt = self._create_system_prompt()
+        # 工具线程池: 模型一次返回多个工具调用时并发执行,总耗时约为最慢的那个
+        self._tool_pool = ThreadPoolExecutor(
+            max_workers=settings.tool_concurrency_limit,
+            thread_name_prefix=f"{name}-tool"
+        )
+
+        # 系统提示词 + 工具schema(会被KV Cache缓存,节省成本)
+        self.system_prompt, self.openai_tools, self.prefix_hash = self._warm_prefix()
+        self.system_prompt_tokens = self.estimate_tokens(self.system_prompt)
+
+        # 相同前缀的请求带同一个 prompt_cache_key,让服务端路由到同一缓存节点
+        self.prompt_cache_key = prompt_cache_key or self.prefix_hash
+        self._extra_body = {"prompt_cache_key": self.prompt_cache_key}
+
+        # 最近一次 run_stream 的完整结果
+        self.last_response: Optional[AgentResponse] = None
+
+        # 统计缓存: (stats_version, stats)
+        self._stats_cache: Optional[Tuple[int, Dict]] = None
 
         print(f"✅ 混合架构Agent初始化成功")
         print(f"   引擎: OpenAI原生API ({self.model})")
@@ -74,6 +230,40 @@ class HybridReasoningAgent(BaseAgent):
         print(f"   温度: {self.temperature}")
         print()
 
+    def _warm_prefix(self) -> Tuple[str, Tuple[Dict, ...], str]:
+        """
+        获取请求前缀(系统提示词 + 工具schema)
+
+        首次遇到某个 (模型, 工具签名) 时生成并放入进程级缓存,
+        之后的Agent实例直接复用,保证前缀逐字节一致
+
+        Returns:
+            (系统提示词, OpenAI工具格式, 前缀哈希)
+        """
+        key = (
+            type(self),
+            self.model,
+            # 参数模型类也在键里: 同名同描述但参数不同的工具不会复用错误的schema
+            tuple(
+                (tool.name, tool.description, getattr(tool, 'args_schema', None))
+                for tool in self.tools
+            )
+        )
+        cached = self._PREFIX_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        system_prompt = self._create_system_prompt()
+        # 冻结为元组: 每次请求都传同一个对象,不再重新构建
+        openai_tools = tuple(self._convert_tools_to_openai_format())
+        prefix_hash = hashlib.sha256(
+            (system_prompt + json.dumps(openai_tools, sort_keys=True, ensure_ascii=False)).encode("utf-8")
+        ).hexdigest()
+
+        cached = (system_prompt, openai_tools, prefix_hash)
+        self._PREFIX_CACHE[key] = cached
+        return cached
+
     def _create_system_prompt(self) -> str:
         """
         创建系统提示词
@@ -118,33 +308,10 @@ class HybridReasoningAgent(BaseAgent):
 
         这是混合架构的关键: 保留LangChain工具定义,但用OpenAI格式调用
         """
-        openai_tools = []
-
-        for tool in self.tools:
-            # 提取参数schema
-            if hasattr(tool, 'args_schema') and tool.args_schema:
-                # 使用model_json_schema替代deprecated的schema方法
-                parameters = tool.args_schema.model_json_schema()
-            else:
-                parameters = {
-                    "type": "object",
-                    "properties": {},
-                    "required": []
-                }
-
-            # 转换为OpenAI格式
-            openai_tool = {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": parameters
-                }
-            }
-
-            openai_tools.append(openai_tool)
-
-        return openai_tools
+        return [
+            _openai_tool(tool.name, tool.description, getattr(tool, 'args_schema', None))
+            for tool in self.tools
+        ]
 
     def _execute_tool(self, tool_name: str, arguments: Dict) -> str:
         """
@@ -169,13 +336,19 @@ class HybridReasoningAgent(BaseAgent):
 
     def _check_end_keywords(self, user_input: str) -> bool:
         """检查是否包含结束关键词"""
-        end_keywords = [
-            '再见', '拜拜', 'bye', 'goodbye', '退出', '结束',
-            '关闭', '离开', '不聊了', '走了', 'quit', 'exit',
-            '886', '88', '下线', '断开'
-        ]
-        user_lower = user_input.lower().strip()
-        return any(keyword in user_lower for keyword in end_keywords)
+        return self._END_RE.search(user_input) is not None
+
+    def _is_farewell(self, user_input: str) -> bool:
+        """检查整句是否只是告别语(明确要结束对话)"""
+        return self._FAREWELL_RE.match(user_input.strip()) is not None
+
+    def _end_note(self, user_input: str) -> Optional[str]:
+        """预处理提示: 明确告别/包含结束关键词/无"""
+        if self._is_farewell(user_input):
+            return self._END_FORCED_NOTE
+        if self._check_end_keywords(user_input):
+            return self._END_HINT_NOTE
+        return None
 
     def run(
         self,
@@ -192,18 +365,7 @@ class HybridReasoningAgent(BaseAgent):
         Returns:
             AgentResponse: 执行结果
         """
-        if show_reasoning:
-            print("\n" + "="*70)
-            print("🧠 混合架构推理过程(OpenAI原生 + LangChain工具)")
-            print("="*70)
-
-        # 检测结束关键词
-        contains_end_keyword = self._check_end_keywords(user_input)
-        if contains_end_keyword and show_reasoning:
-            print(f"\n🔍 预处理: 检测到结束关键词,将强制要求调用end_conversation_detector")
-
-        # 构建消息(利用KV Cache)
-        messages = self._build_messages(user_input, contains_end_keyword)
+        messages = self._start_turn(user_input, show_reasoning)
 
         # 推理步骤记录
         reasoning_steps = []
@@ -212,140 +374,434 @@ class HybridReasoningAgent(BaseAgent):
         try:
             # 第一次调用: 模型决策
             if show_reasoning:
-                print(f"\n{'─'*70}")
-                print("📡 调用OpenAI API进行推理...")
-                print(f"{'─'*70}")
+                print(self._CALLING_BANNER)
 
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                tools=self.openai_tools,
-                tool_choice="auto",
-                temperature=self.temperature
+                **self._request_kwargs(messages, self._tool_choice(user_input))
             )
-
             assistant_message = response.choices[0].message
 
             # 处理工具调用
             if assistant_message.tool_calls:
+                tool_calls = self._tool_call_dicts(assistant_message.tool_calls)
                 if show_reasoning:
-                    print(f"\n✅ 模型决定调用工具(共{len(assistant_message.tool_calls)}个)")
-
-                # 添加助手消息到历史
-                messages.append({
-                    "role": "assistant",
-                    "content": assistant_message.content or "",
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        } for tc in assistant_message.tool_calls
-                    ]
-                })
+                    print(self._TOOLS_DECIDED.format(len(tool_calls)))
 
-                # 执行每个工具调用
-                for tool_call in assistant_message.tool_calls:
-                    tool_call_count += 1
-                    tool_name = tool_call.function.name
-                    arguments = json.loads(tool_call.function.arguments)
-
-                    if show_reasoning:
-                        self._display_tool_call(
-                            tool_call_count,
-                            tool_name,
-                            arguments
-                        )
-
-                    # 执行LangChain工具
-                    result = self._execute_tool(tool_name, arguments)
-
-                    if show_reasoning:
-                        self._display_tool_result(result)
-
-                    # 记录推理步骤
-                    reasoning_steps.append({
-                        'step': tool_call_count,
-                        'tool': tool_name,
-                        'arguments': arguments,
-                        'result': result
-                    })
-
-                    # 添加工具结果到消息
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": result
-                    })
+                tool_call_count = self._execute_tool_calls(
+                    messages, assistant_message.content, tool_calls, reasoning_steps, show_reasoning
+                )
 
                 # 第二次调用: 基于工具结果生成最终回答
                 if show_reasoning:
-                    print(f"\n{'─'*70}")
-                    print("💭 模型基于工具结果生成最终回答...")
-                    print(f"{'─'*70}")
-
-                final_response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    temperature=self.temperature
-                )
+                    print(self._ANSWERING_BANNER)
 
+                final_response = self.client.chat.completions.create(**self._request_kwargs(messages))
                 final_answer = final_response.choices[0].message.content
             else:
                 # 没有工具调用,直接回答
                 if show_reasoning:
-                    print("\n⚠️  模型选择直接回答(未调用工具)")
+                    print(self._DIRECT_ANSWER_NOTE)
                 final_answer = assistant_message.content
 
-            # 更新对话历史(用于KV Cache)
-            if self.enable_cache:
-                self.conversation_history.append({
-                    "role": "user",
-                    "content": user_input
-                })
-                self.conversation_history.append({
-                    "role": "assistant",
-                    "content": final_answer
-                })
+            return self._finish_turn(
+                user_input, final_answer, reasoning_steps, tool_call_count, show_reasoning
+            )
+
+        except Exception as e:
+            return self._error_response(e)
+
+    @property
+    def aclient(self) -> AsyncOpenAI:
+        """异步客户端: 供 arun() 使用,便于嵌入异步服务(如FastAPI);按当前事件循环共享连接池"""
+        return _loop_async_client(self.api_key)
+
+    async def arun(
+        self,
+        user_input: str,
+        show_reasoning: bool = True
+    ) -> AgentResponse:
+        """
+        执行推理(异步,非流式)
+
+        与 run() 行为一致,但等待OpenAI响应时不阻塞事件循环,
+        多个会话可在同一进程内并发处理。
+
+        注意: Agent实例持有对话历史,不能被多个协程同时使用,
+        每个并发会话应使用独立的Agent实例。
+
+        Args:
+            user_input: 用户输入
+            show_reasoning: 是否显示推理过程
+
+        Returns:
+            AgentResponse: 执行结果
+        """
+        messages = self._start_turn(user_input, show_reasoning)
+
+        reasoning_steps = []
+        tool_call_count = 0
+
+        try:
+            if show_reasoning:
+                print(self._CALLING_BANNER)
+
+            response = await self.aclient.chat.completions.create(
+                **self._request_kwargs(messages, self._tool_choice(user_input))
+            )
+            assistant_message = response.choices[0].message
+
+            if assistant_message.tool_calls:
+                tool_calls = self._tool_call_dicts(assistant_message.tool_calls)
+                if show_reasoning:
+                    print(self._TOOLS_DECIDED.format(len(tool_calls)))
+
+                tool_call_count = await self._aexecute_tool_calls(
+                    messages, assistant_message.content, tool_calls, reasoning_steps, show_reasoning
+                )
+
+                if show_reasoning:
+                    print(self._ANSWERING_BANNER)
+
+                final_response = await self.aclient.chat.completions.create(**self._request_kwargs(messages))
+                final_answer = final_response.choices[0].message.content
+            else:
+                if show_reasoning:
+                    print(self._DIRECT_ANSWER_NOTE)
+                final_answer = assistant_message.content
 
+            return self._finish_turn(
+                user_input, final_answer, reasoning_steps, tool_call_count, show_reasoning
+            )
+
+        except Exception as e:
+            return self._error_response(e)
+
+    def run_stream(
+        self,
+        user_input: str,
+        show_reasoning: bool = False
+    ) -> Iterator[str]:
+        """
+        执行推理(流式)
+
+        逐段产出最终回答的文本增量,工具调用在内部完成;
+        生成结束后完整结果保存在 self.last_response
+
+        Args:
+            user_input: 用户输入
+            show_reasoning: 是否显示推理过程
+
+        Yields:
+            回答文本增量
+        """
+        self.last_response = None
+        messages = self._start_turn(user_input, show_reasoning)
+
+        reasoning_steps = []
+        tool_call_count = 0
+        answer_parts = []
+
+        try:
+            # 第一次调用: 模型决策(直接回答时内容边生成边产出)
             if show_reasoning:
-                print(f"\n{'='*70}")
-                print("💬 最终回答")
-                print(f"{'='*70}")
-                print(final_answer)
-                print(f"{'='*70}\n")
-
-            # 检查是否需要结束对话
-            should_end = any(
-                step['tool'] == 'end_conversation_detector' and
-                'END_CONVERSATION' in step['result']
-                for step in reasoning_steps
+                print(self._CALLING_BANNER)
+
+            tool_calls: Dict[int, Dict[str, str]] = {}
+            stream = self.client.chat.completions.create(
+                **self._request_kwargs(messages, self._tool_choice(user_input), stream=True)
             )
+            for delta in self._iter_stream(stream, tool_calls):
+                answer_parts.append(delta)
+                yield delta
+
+            if tool_calls:
+                if show_reasoning:
+                    print(self._TOOLS_DECIDED.format(len(tool_calls)))
+
+                tool_call_count = self._execute_tool_calls(
+                    messages,
+                    "".join(answer_parts),
+                    [tool_calls[i] for i in sorted(tool_calls)],
+                    reasoning_steps,
+                    show_reasoning
+                )
 
-            return AgentResponse(
-                success=True,
-                output=final_answer,
-                reasoning_steps=reasoning_steps,
-                tool_calls=tool_call_count,
-                metadata={
-                    'should_end': should_end,
-                    'cached_tokens': len(self.conversation_history) if self.enable_cache else 0
-                }
+                # 第二次调用: 基于工具结果流式生成最终回答
+                if show_reasoning:
+                    print(self._ANSWERING_BANNER)
+
+                stream = self.client.chat.completions.create(**self._request_kwargs(messages, stream=True))
+                for delta in self._iter_stream(stream):
+                    answer_parts.append(delta)
+                    yield delta
+
+            self.last_response = self._finish_turn(
+                user_input, "".join(answer_parts), reasoning_steps, tool_call_count, show_reasoning
             )
 
         except Exception as e:
-            error_msg = f"执行错误: {str(e)}"
-            print(f"\n❌ {error_msg}")
-            return AgentResponse(
-                success=False,
-                output=error_msg,
-                error=str(e)
+            self.last_response = self._error_response(e)
+
+    def _start_turn(self, user_input: str, show_reasoning: bool) -> List[Dict]:
+        """显示推理标题和结束关键词预处理结果,构建本轮请求的消息列表"""
+        if show_reasoning:
+            print(self._REASONING_HEADER)
+            end_note = self._end_note(user_input)
+            if end_note:
+                print(end_note)
+
+        # 构建消息(利用KV Cache)
+        return self._build_messages(user_input)
+
+    def _request_kwargs(self, messages: List[Dict], tool_choice=None, stream: bool = False) -> Dict:
+        """
+        chat.completions.create 的参数(run/arun/run_stream 共用)
+
+        Args:
+            messages: 消息列表
+            tool_choice: 第一次调用(模型决策)时传入,附带工具定义;生成最终回答时为None
+            stream: 是否流式返回
+        """
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "extra_body": self._extra_body
+        }
+        if tool_choice is not None:
+            kwargs["tools"] = self.openai_tools
+            kwargs["tool_choice"] = tool_choice
+        if stream:
+            kwargs["stream"] = True
+        return kwargs
+
+    @staticmethod
+    def _tool_call_dicts(tool_calls) -> List[Dict[str, str]]:
+        """把SDK返回的工具调用转换为 [{"id", "name", "arguments"}]"""
+        return [
+            {
+                "id": tc.id,
+                "name": tc.function.name,
+                "arguments": tc.function.arguments
+            } for tc in tool_calls
+        ]
+
+    @staticmethod
+    def _error_response(error: Exception) -> AgentResponse:
+        """打印并构造执行失败的结果"""
+        error_msg = f"执行错误: {str(error)}"
+        print(f"\n❌ {error_msg}")
+        return AgentResponse(
+            success=False,
+            output=error_msg,
+            error=str(error)
+        )
+
+    @staticmethod
+    def _iter_stream(stream, tool_calls: Optional[Dict[int, Dict[str, str]]] = None) -> Iterator[str]:
+        """
+        消费流式响应: 产出文本增量,并把分片到达的工具调用按index拼接到 tool_calls
+        """
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+
+            if tool_calls is not None and delta.tool_calls:
+                for tc in delta.tool_calls:
+                    entry = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                    if tc.id:
+                        entry["id"] = tc.id
+                    if tc.function:
+                        entry["name"] += tc.function.name or ""
+                        entry["arguments"] += tc.function.arguments or ""
+
+            if delta.content:
+                yield delta.content
+
+    def _execute_tool_calls(
+        self,
+        messages: List[Dict],
+        content: Optional[str],
+        tool_calls: List[Dict[str, str]],
+        reasoning_steps: List[Dict],
+        show_reasoning: bool
+    ) -> int:
+        """
+        执行模型请求的工具调用,并把助手消息和工具结果追加到 messages
+
+        Args:
+            messages: 当前请求的消息列表(原地追加)
+            content: 助手消息文本
+            tool_calls: [{"id", "name", "arguments"}],arguments为JSON字符串
+            reasoning_steps: 推理步骤记录(原地追加)
+            show_reasoning: 是否显示推理过程
+
+        Returns:
+            执行的工具调用次数
+        """
+        calls = self._prepare_tool_calls(messages, content, tool_calls)
+
+        # 多个工具调用互不依赖: 提交到线程池并发执行,单个调用直接在当前线程执行
+        if len(calls) > 1:
+            futures = [
+                self._tool_pool.submit(self._execute_tool, tool_call["name"], arguments)
+                for tool_call, arguments in calls
+            ]
+            results = [self._wait_tool(future) for future in futures]
+        else:
+            results = [
+                self._execute_tool(tool_call["name"], arguments)
+                for tool_call, arguments in calls
+            ]
+
+        return self._record_tool_results(messages, calls, results, reasoning_steps, show_reasoning)
+
+    async def _aexecute_tool_calls(
+        self,
+        messages: List[Dict],
+        content: Optional[str],
+        tool_calls: List[Dict[str, str]],
+        reasoning_steps: List[Dict],
+        show_reasoning: bool
+    ) -> int:
+        """_execute_tool_calls 的异步版本: 工具在线程池中执行,不阻塞事件循环"""
+        calls = self._prepare_tool_calls(messages, content, tool_calls)
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            self._await_tool(
+                loop.run_in_executor(self._tool_pool, self._execute_tool, tool_call["name"], arguments)
             )
+            for tool_call, arguments in calls
+        ])
+
+        return self._record_tool_results(messages, calls, results, reasoning_steps, show_reasoning)
+
+    @staticmethod
+    def _prepare_tool_calls(
+        messages: List[Dict],
+        content: Optional[str],
+        tool_calls: List[Dict[str, str]]
+    ) -> List[Tuple[Dict[str, str], Dict]]:
+        """追加助手消息,并解析每个工具调用的参数"""
+        # 添加助手消息到历史
+        messages.append({
+            "role": "assistant",
+            "content": content or "",
+            "tool_calls": [
+                {
+                    "id": tc["id"],
+                    "type": "function",
+                    "function": {
+                        "name": tc["name"],
+                        "arguments": tc["arguments"]
+                    }
+                } for tc in tool_calls
+            ]
+        })
+
+        return [
+            (tool_call, _json_loads(tool_call["arguments"] or "{}"))
+            for tool_call in tool_calls
+        ]
+
+    def _record_tool_results(
+        self,
+        messages: List[Dict],
+        calls: List[Tuple[Dict[str, str], Dict]],
+        results: List[str],
+        reasoning_steps: List[Dict],
+        show_reasoning: bool
+    ) -> int:
+        """按原始顺序展示并记录工具结果,返回工具调用次数"""
+        for step, ((tool_call, arguments), result) in enumerate(zip(calls, results), 1):
+            tool_name = tool_call["name"]
+
+            if show_reasoning:
+                self._display_tool_call(step, tool_name, arguments)
+                self._display_tool_result(result)
+
+            # 记录推理步骤
+            reasoning_steps.append({
+                'step': step,
+                'tool': tool_name,
+                'arguments': arguments,
+                'result': result
+            })
+
+            # 添加工具结果到消息
+            messages.append({
+                "role": "tool",
+                "tool_call_id": tool_call["id"],
+                "content": result
+            })
+
+        return len(calls)
+
+    @staticmethod
+    def _wait_tool(future) -> str:
+        """等待并发工具调用的结果(超时不影响其他工具)"""
+        try:
+            return future.result(timeout=settings.timeout)
+        except FutureTimeoutError:
+            return f"工具执行错误: 超时({settings.timeout}秒)"
 
-    def _build_messages(self, user_input: str, force_end_detection: bool = False) -> List[Dict]:
+    @staticmethod
+    async def _await_tool(future) -> str:
+        """_wait_tool 的异步版本"""
+        try:
+            return await asyncio.wait_for(future, timeout=settings.timeout)
+        except asyncio.TimeoutError:
+            return f"工具执行错误: 超时({settings.timeout}秒)"
+
+    def _finish_turn(
+        self,
+        user_input: str,
+        final_answer: str,
+        reasoning_steps: List[Dict],
+        tool_call_count: int,
+        show_reasoning: bool
+    ) -> AgentResponse:
+        """更新对话历史并构造本轮结果"""
+        # 更新对话历史(用于KV Cache)
+        if self.enable_cache:
+            self.append_turn(user_input, final_answer)
+
+        if show_reasoning:
+            print(f"\n{'='*70}\n💬 最终回答\n{'='*70}\n{final_answer}\n{'='*70}\n")
+
+        # 检查是否需要结束对话
+        should_end = any(
+            step['tool'] == 'end_conversation_detector' and
+            'END_CONVERSATION' in step['result']
+            for step in reasoning_steps
+        )
+
+        return AgentResponse(
+            success=True,
+            output=final_answer,
+            reasoning_steps=reasoning_steps,
+            tool_calls=tool_call_count,
+            metadata={
+                'should_end': should_end,
+                'cached_tokens': len(self.conversation_history) if self.enable_cache else 0
+            },
+            tool_names=[step['tool'] for step in reasoning_steps]
+        )
+
+    def _tool_choice(self, user_input: str):
+        """
+        第一次调用的 tool_choice
+
+        整句是告别语时通过 tool_choice 强制调用end_conversation_detector;
+        其他情况(包括句中含结束关键词)使用"auto",所有工具都可选
+        """
+        if self._is_farewell(user_input) and self._END_TOOL_CHOICE["function"]["name"] in self.tool_map:
+            return self._END_TOOL_CHOICE
+        return "auto"
+
+    def _build_messages(self, user_input: str) -> List[Dict]:
         """
         构建消息列表
 
@@ -358,63 +814,86 @@ class HybridReasoningAgent(BaseAgent):
 
         # 添加对话历史(KV Cache优化)
         if self.enable_cache:
+            # 窗口外的早期对话以摘要形式放在系统提示词之后,不改动可缓存的前缀
+            if self.memory_summaries:
+                messages.append({
+                    "role": "system",
+                    "content": "更早的对话摘要:\n" + "\n".join(
+                        f"- {summary}" for summary in self.memory_summaries
+                    )
+                })
             messages.extend(self.conversation_history)
 
         # 添加当前输入
-        user_message = user_input
-        if force_end_detection:
-            user_message += "\n\n[系统要求: 检测到结束关键词,必须调用end_conversation_detector工具]"
-
         messages.append({
             "role": "user",
-            "content": user_message
+            "content": user_input
         })
 
+        # 含结束关键词但不是明确告别: 只提示,不强制(明确告别由 tool_choice 强制)
+        if self._check_end_keywords(user_input) and not self._is_farewell(user_input):
+            messages.append({"role": "system", "content": self._END_HINT})
+
         return messages
 
     def _display_tool_call(self, step: int, tool_name: str, arguments: Dict):
-        """显示工具调用信息"""
-        print(f"\n{'='*70}")
-        print(f"📍 推理步骤 {step}")
-        print(f"{'='*70}")
-        print(f"\n✅ 模型决策:")
-        print(f"   → 选择工具: {tool_name}")
-        print(f"\n📥 模型决定的参数:")
-        print(f"{'─'*70}")
+        """显示工具调用信息(整段拼好后一次输出)"""
         formatted_args = json.dumps(arguments, ensure_ascii=False, indent=6)
-        for line in formatted_args.split('\n'):
-            print(f"   {line}")
-        print(f"{'─'*70}")
+        lines = [
+            f"\n{'='*70}",
+            f"📍 推理步骤 {step}",
+            f"{'='*70}",
+            f"\n✅ 模型决策:",
+            f"   → 选择工具: {tool_name}",
+            f"\n📥 模型决定的参数:",
+            f"{'─'*70}",
+        ]
+        lines.extend(f"   {line}" for line in formatted_args.split('\n'))
+        lines.append(f"{'─'*70}")
+        print("\n".join(lines))
 
     def _display_tool_result(self, result: str):
-        """显示工具执行结果"""
-        print(f"\n📤 工具返回结果:")
-        print(f"{'─'*70}")
+        """显示工具执行结果(整段拼好后一次输出)"""
+        lines = [f"\n📤 工具返回结果:", f"{'─'*70}"]
         if len(result) > 500:
-            print(f"   {result[:500]}...")
-            print(f"   ... (结果过长,已截断)")
+            lines.append(f"   {result[:500]}...")
+            lines.append(f"   ... (结果过长,已截断)")
         else:
-            for line in result.split('\n'):
-                print(f"   {line}")
-        print(f"{'─'*70}")
+            lines.extend(f"   {line}" for line in result.split('\n'))
+        lines.append(f"{'─'*70}")
+        print("\n".join(lines))
 
     def clear_history(self):
         """清除对话历史缓存"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        self.memory_summaries.clear()
+        self.user_turns = 0
+        self.cached_tokens = 0
+        self.stats_version += 1
         print("✅ 对话历史已清除(KV Cache重置)")
 
+    def close(self):
+        """释放工具线程池(不再使用Agent时调用)"""
+        self._tool_pool.shutdown(wait=False)
+
     def get_stats(self) -> Dict:
-        """获取缓存统计信息"""
+        """
+        获取缓存统计信息(对话历史未变化时复用上次结果)
+
+        返回浅拷贝: 调用方修改返回的字典不会影响缓存
+        """
+        if self._stats_cache is not None and self._stats_cache[0] == self.stats_version:
+            return dict(self._stats_cache[1])
+
         base_stats = super().get_stats()
-        return {
+        stats = {
             **base_stats,
-            'estimated_cached_tokens': sum(
-                len(msg['content']) // 4
-                for msg in self.conversation_history
-            ),
-            'system_prompt_tokens': len(self.system_prompt) // 4,
+            'estimated_cached_tokens': self.cached_tokens,
+            'system_prompt_tokens': self.system_prompt_tokens,
             'tools_count': len(self.tools)
         }
+        self._stats_cache = (self.stats_version, stats)
+        return dict(stats)
 
 
 # 导出
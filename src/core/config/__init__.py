@@ -1,4 +1,4 @@
 """Core 配置模块"""
-from src.core.config.settings import settings, Settings
+from src.core.config.settings import settings, Settings, get_settings
 
-__all__ = ['settings', 'Settings']
+__all__ = ['settings', 'Settings', 'get_settings']
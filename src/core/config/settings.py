@@ -6,8 +6,12 @@
 
     api_key = settings.openai_api_key
     model = settings.llm_model
+
+    # 或者通过缓存的工厂函数获取(同一进程内始终是同一个实例)
+    from src.core.config import get_settings
+    settings = get_settings()
 """
-import os
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
 from pydantic import Field
@@ -65,6 +69,33 @@ class Settings(BaseSettings):
         validation_alias='TIMEOUT'
     )
 
+    tool_concurrency_limit: int = Field(
+        default=8,
+        ge=1,
+        description="并发执行工具调用的最大线程数",
+        validation_alias='TOOL_CONCURRENCY_LIMIT'
+    )
+
+    history_max_turns: int = Field(
+        default=10,
+        ge=0,
+        description="对话历史最多保留的轮次(更早的轮次压缩为摘要,0表示不限制)",
+        validation_alias='HISTORY_MAX_TURNS'
+    )
+
+    response_cache_db: Optional[str] = Field(
+        default=None,
+        description="响应缓存持久化SQLite文件路径(为空则只缓存在内存)",
+        validation_alias='RESPONSE_CACHE_DB'
+    )
+
+    response_cache_ttl: int = Field(
+        default=7 * 24 * 3600,
+        ge=0,
+        description="持久化响应缓存的有效期(秒,0表示永不过期)",
+        validation_alias='RESPONSE_CACHE_TTL'
+    )
+
     # ========== TTS 配置 ==========
     enable_tts: bool = Field(
         default=False,
@@ -96,6 +127,12 @@ class Settings(BaseSettings):
         validation_alias='TTS_VOLUME'
     )
 
+    tts_warmup: bool = Field(
+        default=True,
+        description="启动时是否在后台预热TTS本地资源(事件循环、音频设备)",
+        validation_alias='TTS_WARMUP'
+    )
+
     max_chunk_length: int = Field(
         default=100,
         ge=10,
@@ -174,21 +211,32 @@ class Settings(BaseSettings):
             raise ValueError("\n".join(["配置验证失败:"] + errors))
 
 
-# 创建全局配置实例
-try:
-    settings = Settings()
-    # 非严格验证,允许测试环境无API Key
-    settings.validate_config(strict=False)
-except Exception as e:
-    print(f"⚠️  配置加载失败: {e}")
-    print("提示: 请检查 .env 文件")
-    # 测试环境不抛出异常
-    if str(e).startswith("配置验证失败"):
-        raise
-    else:
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取全局配置(只创建和验证一次,之后直接返回缓存的实例)
+
+    Returns:
+        Settings: 配置实例
+    """
+    try:
+        config = Settings()
+        # 非严格验证,允许测试环境无API Key
+        config.validate_config(strict=False)
+    except Exception as e:
+        print(f"⚠️  配置加载失败: {e}")
+        print("提示: 请检查 .env 文件")
+        # 测试环境不抛出异常
+        if str(e).startswith("配置验证失败"):
+            raise
         # 创建默认配置
-        settings = Settings(openai_api_key="test-key")
+        config = Settings(openai_api_key="test-key")
+    return config
+
+
+# 创建全局配置实例(兼容 from src.core.config import settings)
+settings = get_settings()
 
 
 # 导出
-__all__ = ['settings', 'Settings']
+__all__ = ['settings', 'Settings', 'get_settings']
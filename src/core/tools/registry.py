@@ -26,7 +26,8 @@ class ToolRegistry:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._tools: Dict[str, BaseTool] = {}
-            cls._instance._categories: Dict[str, List[str]] = {}
+            # 类别 -> {工具名: None}(有序集合,注册/注销都是O(1))
+            cls._instance._categories: Dict[str, Dict[str, None]] = {}
         return cls._instance
 
     def register(self, tool: BaseTool) -> None:
@@ -45,10 +46,7 @@ class ToolRegistry:
 
         # 按类别索引
         category = tool.category
-        if category not in self._categories:
-            self._categories[category] = []
-        if tool_name not in self._categories[category]:
-            self._categories[category].append(tool_name)
+        self._categories.setdefault(category, {})[tool_name] = None
 
         print(f"✅ 注册工具: {tool_name} (类别: {category})")
 
@@ -83,7 +81,7 @@ class ToolRegistry:
         Returns:
             该类别下的所有工具
         """
-        tool_names = self._categories.get(category, [])
+        tool_names = self._categories.get(category, {})
         return [self._tools[name] for name in tool_names if name in self._tools]
 
     def get_metadata_all(self) -> List[ToolMetadata]:
@@ -128,7 +126,7 @@ class ToolRegistry:
 
             # 从类别索引中删除
             if category in self._categories:
-                self._categories[category].remove(tool_name)
+                self._categories[category].pop(tool_name, None)
                 if not self._categories[category]:
                     del self._categories[category]
 
@@ -1,6 +1,6 @@
 """TTS 服务模块"""
 from src.services.tts.tts_interface import TTSProvider, BaseTTS, EdgeTTS, TTSFactory
-from src.services.tts.tts_optimizer import TTSOptimizer, TTSTextOptimizer, TTSAudioManager
+from src.services.tts.tts_optimizer import TTSOptimizer, TTSTextOptimizer, TTSAudioManager, ChunkBatch
 
 __all__ = [
     'TTSProvider',
@@ -10,4 +10,5 @@ __all__ = [
     'TTSOptimizer',
     'TTSTextOptimizer',
     'TTSAudioManager',
+    'ChunkBatch',
 ]
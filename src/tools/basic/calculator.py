@@ -1,11 +1,94 @@
 """计算器工具"""
 from pydantic import BaseModel, Field
+from functools import lru_cache
+from types import CodeType
 from typing import Type
+import ast
 import math
 
 from src.core.tools.base import BaseTool
 
 
+# 整数幂运算结果的最大位数(约3000位十进制),防止 9**9**9 这类表达式卡死进程
+_MAX_POW_BITS = 10000
+
+
+def _safe_pow(base, exp, mod=None):
+    """有上限的幂运算(** 和 pow 都走这里),整数结果过大时拒绝计算"""
+    if (mod is None and isinstance(base, int) and isinstance(exp, int)
+            and exp > 0 and abs(base) > 1
+            and (abs(base).bit_length() - 1) * exp > _MAX_POW_BITS):
+        raise ValueError("幂运算结果过大")
+    return pow(base, exp, mod)
+
+
+# 安全的数学命名空间(模块级常量,不再每次调用重建)
+_SAFE_DICT = {
+    'sqrt': math.sqrt,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'log': math.log,
+    'exp': math.exp,
+    'pi': math.pi,
+    'e': math.e,
+    'round': round,
+    'abs': abs,
+    'pow': _safe_pow,
+    'floor': math.floor,
+    'ceil': math.ceil,
+}
+
+# 表达式允许出现的语法节点(属性访问、下标、推导式等一律拒绝)
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.keyword,
+    ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub,
+)
+
+
+class _BoundedPow(ast.NodeTransformer):
+    """把 a ** b 改写成 pow(a, b),由 _safe_pow 检查结果大小"""
+
+    def visit_BinOp(self, node: ast.BinOp) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(
+                ast.Call(func=ast.Name(id='pow', ctx=ast.Load()), args=[node.left, node.right], keywords=[]),
+                node
+            )
+        return node
+
+
+@lru_cache(maxsize=512)
+def _compile(expression: str) -> CodeType:
+    """校验并编译表达式(同一表达式只解析编译一次)"""
+    tree = ast.parse(expression.strip(), mode="eval")
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"不支持的语法: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in _SAFE_DICT:
+            raise ValueError(f"未知名称: {node.id}")
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            raise ValueError("只能调用内置数学函数")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"不支持的常量: {node.value!r}")
+    tree = ast.fix_missing_locations(_BoundedPow().visit(tree))
+    return compile(tree, "<calc>", "eval")
+
+
+def evaluate(expression: str):
+    """
+    安全计算数学表达式
+
+    Raises:
+        ValueError: 表达式含不支持的语法/名称,或幂运算结果过大
+        SyntaxError: 表达式无法解析
+    """
+    return eval(_compile(expression), {"__builtins__": {}}, _SAFE_DICT)
+
+
 class CalculatorInput(BaseModel):
     """计算器工具输入"""
     expression: str = Field(description="数学表达式,支持基本运算和函数如sqrt、sin、cos等")
@@ -33,25 +116,7 @@ class CalculatorTool(BaseTool):
 
     def execute(self, expression: str) -> str:
         """执行计算"""
-        # 安全的数学命名空间
-        safe_dict = {
-            'sqrt': math.sqrt,
-            'sin': math.sin,
-            'cos': math.cos,
-            'tan': math.tan,
-            'log': math.log,
-            'exp': math.exp,
-            'pi': math.pi,
-            'e': math.e,
-            'round': round,
-            'abs': abs,
-            'pow': pow,
-            'floor': math.floor,
-            'ceil': math.ceil,
-        }
-
-        result = eval(expression, {"__builtins__": {}}, safe_dict)
-        return str(result)
-
-
-__all__ = ['CalculatorTool']
+        return str(evaluate(expression))
+
+
+__all__ = ['CalculatorTool', 'evaluate']
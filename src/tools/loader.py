@@ -11,11 +11,11 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-# 从旧的 tools.py 导入所有工具
+# 从旧的 tools.py 导入所有工具(已迁移到新结构的工具从 src.tools 导入)
 try:
+    from src.tools.basic.calculator import CalculatorTool
     from tools import (
         # 基础工具
-        CalculatorTool,
         TimeTool,
         TextAnalysisTool,
         UnitConversionTool,
@@ -0,0 +1,6 @@
+"""pytest 配置: 把项目根目录加入导入路径(与 scripts/、examples/ 的做法一致)"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
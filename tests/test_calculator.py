@@ -0,0 +1,64 @@
+"""
+计算器工具测试 - 验证实际加载的 calculator 工具拒绝危险表达式
+
+运行方式:
+    python -m pytest tests/test_calculator.py
+"""
+import time
+
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain")
+
+from src.tools import load_all_tools
+from src.tools.basic.calculator import evaluate
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    """工具加载器实际提供给Agent的 calculator 工具"""
+    return next(tool for tool in load_all_tools() if tool.name == "calculator")
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("1+1", "2"),
+    ("round(sqrt(2), 3)", "1.414"),
+    ("sin(pi/2)", "1.0"),
+    ("2**10", "1024"),
+    ("pow(2, 10, 7)", "2"),
+])
+def test_live_tool_computes(calculator, expression, expected):
+    assert calculator._run(expression=expression) == expected
+
+
+@pytest.mark.parametrize("expression", [
+    "().__class__",
+    "(1).__class__.__bases__",
+    "[1, 2][0]",
+    "(1, 2)[0]",
+    "__import__('os')",
+    "'a' * 3",
+])
+def test_live_tool_rejects_unsafe_syntax(calculator, expression):
+    result = calculator._run(expression=expression)
+    assert "错误" in result
+
+
+@pytest.mark.parametrize("expression", [
+    "9**9**9**9",
+    "pow(10, 10**6)",
+    "2**100000",
+])
+def test_live_tool_rejects_huge_powers(calculator, expression):
+    start = time.time()
+    result = calculator._run(expression=expression)
+    assert "幂运算结果过大" in result
+    assert time.time() - start < 1
+
+
+def test_evaluate_raises_value_error():
+    with pytest.raises(ValueError):
+        evaluate("().__class__")
+    with pytest.raises(ValueError):
+        evaluate("9**9**9**9")
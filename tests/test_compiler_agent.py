@@ -0,0 +1,189 @@
+"""
+CompilerAgent 测试 - 任务调度(TaskFetchingUnit)与执行计划校验
+
+运行方式:
+    python -m pytest tests/test_compiler_agent.py
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain")
+
+from src.core.agents.compiler_agent import CompilerAgent, PlanError, TaskFetchingUnit, validate_plan
+
+
+SCHEMAS = {
+    "calculator": {
+        "type": "object",
+        "properties": {"expression": {"type": "string"}},
+        "required": ["expression"],
+    },
+    "unit_converter": {
+        "type": "object",
+        "properties": {
+            "value": {"type": "number"},
+            "from_unit": {"type": "string"},
+            "to_unit": {"type": "string"},
+        },
+        "required": ["value", "from_unit", "to_unit"],
+    },
+}
+
+
+@pytest.fixture
+def pool():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def _task(task_id, tool="calculator", args=None, deps=()):
+    return {"id": task_id, "tool": tool, "args": args or {}, "deps": list(deps)}
+
+
+# ---------------- TaskFetchingUnit ----------------
+
+def test_placeholder_substitution(pool):
+    """$id 和 ${id} 占位符替换为依赖任务的结果,包括嵌套参数"""
+    def execute(tool, args):
+        return "42" if tool == "first" else repr(args)
+
+    tasks = [
+        _task("1", tool="first"),
+        _task("2", tool="second", args={"a": "$1 + 1", "b": ["${1}"], "c": {"d": "$1"}, "e": 3}, deps=["1"]),
+    ]
+    results = TaskFetchingUnit(pool, execute, timeout=5).run(tasks)
+
+    assert results["1"] == "42"
+    assert tasks[1]["resolved_args"] == {"a": "42 + 1", "b": ["42"], "c": {"d": "42"}, "e": 3}
+
+
+def test_unknown_placeholder_kept():
+    """引用不存在的任务时保留原占位符"""
+    assert TaskFetchingUnit._substitute("$9", {"1": "x"}) == "$9"
+
+
+def test_dependency_ordering(pool):
+    """互不依赖的任务并发执行,依赖任务等所有依赖完成后才开始"""
+    events = []
+    lock = threading.Lock()
+
+    def execute(tool, args):
+        with lock:
+            events.append(("start", tool))
+        time.sleep(0.1)
+        with lock:
+            events.append(("end", tool))
+        return tool
+
+    tasks = [_task("1", tool="a"), _task("2", tool="b"), _task("3", tool="c", deps=["1", "2"])]
+    results = TaskFetchingUnit(pool, execute, timeout=5).run(tasks)
+
+    assert results == {"1": "a", "2": "b", "3": "c"}
+    # a、b 并发: 两者都在任一结束前开始
+    assert {event for event in events[:2]} == {("start", "a"), ("start", "b")}
+    # c 在 a、b 都结束后才开始
+    assert events.index(("start", "c")) > max(events.index(("end", "a")), events.index(("end", "b")))
+
+
+@pytest.mark.parametrize("tasks", [
+    [_task("1", deps=["2"]), _task("2", deps=["1"])],
+    [_task("1", deps=["9"])],
+], ids=["cycle", "unknown-dep"])
+def test_unsatisfiable_dependencies(pool, tasks):
+    """成环或依赖不存在的任务不执行,直接返回错误"""
+    calls = []
+    results = TaskFetchingUnit(pool, lambda tool, args: calls.append(tool), timeout=5).run(tasks)
+
+    assert calls == []
+    assert all(result == "工具执行错误: 依赖无法满足" for result in results.values())
+    assert set(results) == {task["id"] for task in tasks}
+
+
+def test_unsatisfiable_after_partial_run(pool):
+    """可执行的任务照常执行,只有依赖无法满足的任务报错"""
+    tasks = [_task("1"), _task("2", deps=["1", "9"])]
+    results = TaskFetchingUnit(pool, lambda tool, args: "ok", timeout=5).run(tasks)
+
+    assert results == {"1": "ok", "2": "工具执行错误: 依赖无法满足"}
+
+
+def test_timeout(pool):
+    """超时的任务返回超时错误"""
+    tasks = [_task("1")]
+    results = TaskFetchingUnit(pool, lambda tool, args: time.sleep(0.5), timeout=0.05).run(tasks)
+
+    assert results["1"].startswith("工具执行错误: 超时")
+
+
+# ---------------- 计划校验 ----------------
+
+def test_validate_plan_normalizes():
+    """合法计划: id/deps 统一为字符串,占位符跳过类型检查"""
+    raw = [
+        {"id": 1, "tool": "calculator", "args": {"expression": "2*3"}},
+        {"id": 2, "tool": "unit_converter", "args": {"value": "$1", "from_unit": "km", "to_unit": "m"}, "deps": [1]},
+    ]
+    tasks = validate_plan(raw, SCHEMAS)
+
+    assert [task["id"] for task in tasks] == ["1", "2"]
+    assert tasks[1]["deps"] == ["1"]
+    assert tasks[0]["deps"] == []
+
+
+def test_validate_plan_adds_placeholder_deps():
+    """占位符引用的任务自动补进 deps,不依赖执行时序"""
+    raw = [
+        {"id": 1, "tool": "calculator", "args": {"expression": "2*3"}},
+        {"id": 2, "tool": "calculator", "args": {"expression": "${1} + 1"}},
+    ]
+    tasks = validate_plan(raw, SCHEMAS)
+
+    assert tasks[1]["deps"] == ["1"]
+
+
+@pytest.mark.parametrize("raw, message", [
+    ({"id": 1}, "tasks 必须是列表"),
+    ([{"tool": "calculator", "args": {"expression": "1"}}], "缺少 id 或 tool"),
+    ([{"id": 1, "args": {"expression": "1"}}], "缺少 id 或 tool"),
+    ([{"id": 1, "tool": "calculator", "args": {"expression": "1"}},
+      {"id": "1", "tool": "calculator", "args": {"expression": "2"}}], "任务id重复"),
+    ([{"id": 1, "tool": "web_search", "args": {}}], "未知工具"),
+    ([{"id": 1, "tool": "calculator", "args": "1+1"}], "args 必须是对象"),
+    ([{"id": 1, "tool": "calculator", "args": {}}], "缺少参数: expression"),
+    ([{"id": 1, "tool": "calculator", "args": {"expression": "1", "x": 2}}], "未知参数: x"),
+    ([{"id": 1, "tool": "calculator", "args": {"expression": 1}}], "应为 string"),
+    ([{"id": 1, "tool": "unit_converter", "args": {"value": True, "from_unit": "km", "to_unit": "m"}}], "应为 number"),
+    ([{"id": 1, "tool": "calculator", "args": {"expression": "$9 * 2"}}], "不存在的任务: 9"),
+    ([{"id": 1, "tool": "calculator", "args": {"expression": "1"}, "deps": [9]}], "不存在的任务: 9"),
+    ([{"id": 1, "tool": "calculator", "args": {"expression": "$1 * 2"}}], "不能依赖自身"),
+])
+def test_validate_plan_rejects(raw, message):
+    """不合法的计划抛出 PlanError 而不是 KeyError"""
+    with pytest.raises(PlanError, match=message):
+        validate_plan(raw, SCHEMAS)
+
+
+def test_plan_invalid_json_keeps_cause():
+    """计划不是合法JSON时抛出 PlanError,并保留原始解析异常"""
+    response = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="{not json"))])
+    agent = object.__new__(CompilerAgent)
+    agent.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **kwargs: response
+    )))
+    agent.model = "gpt-4"
+    agent.temperature = 0.0
+    agent._extra_body = {}
+    agent._tools_instruction = ""
+    agent.tool_schemas = SCHEMAS
+
+    with pytest.raises(PlanError, match="计划不是合法JSON") as info:
+        agent._plan([{"role": "user", "content": "hi"}])
+    assert isinstance(info.value.__cause__, ValueError)
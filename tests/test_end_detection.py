@@ -0,0 +1,56 @@
+"""
+结束对话检测测试 - 只有明确告别才强制调用 end_conversation_detector
+
+运行方式:
+    python -m pytest tests/test_end_detection.py
+"""
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain")
+
+from src.core.agents.hybrid_agent import HybridReasoningAgent
+
+
+@pytest.fixture
+def agent():
+    """不经过 __init__(不创建客户端、不打印),只设置判断所需的属性"""
+    agent = object.__new__(HybridReasoningAgent)
+    agent.tool_map = {"calculator": None, "end_conversation_detector": None}
+    agent.enable_cache = False
+    agent.system_prompt = "system"
+    return agent
+
+
+@pytest.mark.parametrize("user_input", [
+    "再见", "好的，再见！", "拜拜", "Bye bye!", "exit", "88", "谢谢，再见", "那我走了", "再见啦~",
+])
+def test_farewell_forces_end_tool(agent, user_input):
+    """整句是告别语时强制调用 end_conversation_detector,不附加提示"""
+    assert agent._tool_choice(user_input) == HybridReasoningAgent._END_TOOL_CHOICE
+    assert agent._build_messages(user_input)[-1] == {"role": "user", "content": user_input}
+
+
+@pytest.mark.parametrize("user_input", [
+    "计算 188*2", "会议几点结束?", "退出程序的快捷键是什么", "离开公司要多久",
+])
+def test_keyword_in_sentence_keeps_tools_available(agent, user_input):
+    """句中含结束关键词时保持 auto,只在用户消息后附加提示"""
+    assert agent._tool_choice(user_input) == "auto"
+    messages = agent._build_messages(user_input)
+    assert messages[-2] == {"role": "user", "content": user_input}
+    assert messages[-1] == {"role": "system", "content": HybridReasoningAgent._END_HINT}
+
+
+def test_plain_input(agent):
+    """普通输入: auto,不附加提示"""
+    assert agent._tool_choice("现在几点") == "auto"
+    assert agent._build_messages("现在几点")[-1]["role"] == "user"
+
+
+def test_no_end_tool_falls_back_to_auto(agent):
+    """没有 end_conversation_detector 工具时不强制"""
+    agent.tool_map = {"calculator": None}
+    assert agent._tool_choice("再见") == "auto"
@@ -0,0 +1,182 @@
+"""
+HybridReasoningAgent 测试 - run / arun / run_stream 发出相同的请求并得到相同的结果
+
+使用桩客户端,不访问网络
+
+运行方式:
+    python -m pytest tests/test_hybrid_agent.py
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Type
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain")
+
+from pydantic import BaseModel, Field
+
+from src.core.agents import hybrid_agent
+from src.core.agents.hybrid_agent import HybridReasoningAgent
+from src.core.tools.base import BaseTool
+from src.tools import load_all_tools
+
+
+TOOL_ARGS = json.dumps({"expression": "2*21"})
+
+
+def _message(content=None, tool_calls=None):
+    return SimpleNamespace(content=content, tool_calls=tool_calls)
+
+
+def _response(message):
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _chunk(content=None, tool_calls=None):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=_message(content, tool_calls))])
+
+
+def _tool_call():
+    return SimpleNamespace(
+        index=0, id="call_1", function=SimpleNamespace(name="calculator", arguments=TOOL_ARGS)
+    )
+
+
+class _StubCompletions:
+    """第一次调用返回一个 calculator 工具调用,第二次返回最终回答;记录每次请求参数"""
+
+    def __init__(self):
+        self.requests = []
+
+    def _reply(self, kwargs):
+        self.requests.append({k: v for k, v in kwargs.items() if k not in ("messages", "stream")})
+        first = len(self.requests) == 1
+        if kwargs.get("stream"):
+            return iter([_chunk(tool_calls=[_tool_call()])] if first else [_chunk("答案"), _chunk("是42")])
+        return _response(_message(tool_calls=[_tool_call()]) if first else _message("答案是42"))
+
+    def create(self, **kwargs):
+        return self._reply(kwargs)
+
+
+class _AsyncStubCompletions(_StubCompletions):
+    async def create(self, **kwargs):
+        return self._reply(kwargs)
+
+
+def _client(completions):
+    return SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    return [tool for tool in load_all_tools() if tool.name == "calculator"]
+
+
+@pytest.fixture
+def agent(calculator):
+    return HybridReasoningAgent(tools=calculator, api_key="sk-test", enable_cache=True)
+
+
+def _run(agent, user_input):
+    completions = _StubCompletions()
+    agent.client = _client(completions)
+    return agent.run(user_input, show_reasoning=False), completions.requests
+
+
+def _arun(agent, user_input, monkeypatch):
+    completions = _AsyncStubCompletions()
+    monkeypatch.setattr(hybrid_agent, "_loop_async_client", lambda api_key: _client(completions))
+    return asyncio.run(agent.arun(user_input, show_reasoning=False)), completions.requests
+
+
+def _run_stream(agent, user_input):
+    completions = _StubCompletions()
+    agent.client = _client(completions)
+    deltas = list(agent.run_stream(user_input, show_reasoning=False))
+    assert "".join(deltas) == "答案是42"
+    return agent.last_response, completions.requests
+
+
+def test_paths_send_same_requests(calculator, monkeypatch):
+    """三条路径的两次请求参数一致: 第一次带工具定义和 tool_choice,第二次不带"""
+    results = [
+        _run(HybridReasoningAgent(tools=calculator, api_key="sk-test"), "计算 2*21"),
+        _arun(HybridReasoningAgent(tools=calculator, api_key="sk-test"), "计算 2*21", monkeypatch),
+        _run_stream(HybridReasoningAgent(tools=calculator, api_key="sk-test"), "计算 2*21"),
+    ]
+
+    requests = [sent for _, sent in results]
+    assert requests[0] == requests[1] == requests[2]
+
+    first, second = requests[0]
+    assert first["tool_choice"] == "auto"
+    assert [tool["function"]["name"] for tool in first["tools"]] == ["calculator"]
+    assert "tools" not in second and "tool_choice" not in second
+    assert first["extra_body"] == second["extra_body"]
+
+    for result, _ in results:
+        assert result.success
+        assert result.output == "答案是42"
+        assert result.tool_names == ["calculator"]
+        assert result.reasoning_steps[0]["result"] == "42"
+
+
+def test_error_response(agent):
+    """请求失败时返回 success=False 的结果,而不是抛出异常"""
+    def fail(**kwargs):
+        raise RuntimeError("boom")
+
+    agent.client = _client(SimpleNamespace(create=fail))
+
+    result = agent.run("你好", show_reasoning=False)
+    assert not result.success and result.error == "boom"
+
+    assert list(agent.run_stream("你好")) == []
+    assert not agent.last_response.success and agent.last_response.error == "boom"
+
+
+class _QueryInput(BaseModel):
+    query: str = Field(description="查询内容")
+
+
+class _CityInput(BaseModel):
+    city: str = Field(description="城市")
+
+
+def _lookup_tool(schema: Type[BaseModel]) -> BaseTool:
+    """名称和描述相同、只有参数模型不同的工具"""
+    class LookupTool(BaseTool):
+        name: str = "lookup"
+        description: str = "查询信息"
+        args_schema: Type[BaseModel] = schema
+
+        def execute(self, **kwargs) -> str:
+            return "ok"
+
+    return LookupTool()
+
+
+def test_prefix_cache_keyed_by_args_schema():
+    """同名同描述但参数不同的工具集不共用缓存的前缀"""
+    first = HybridReasoningAgent(tools=[_lookup_tool(_QueryInput)], api_key="sk-test")
+    second = HybridReasoningAgent(tools=[_lookup_tool(_CityInput)], api_key="sk-test")
+
+    assert list(first.openai_tools[0]["function"]["parameters"]["properties"]) == ["query"]
+    assert list(second.openai_tools[0]["function"]["parameters"]["properties"]) == ["city"]
+    assert first.prefix_hash != second.prefix_hash
+
+
+def test_stats_not_shared_with_callers(agent):
+    """修改 get_stats 的返回值不影响之后的结果"""
+    stats = agent.get_stats()
+    stats['conversation_turns'] = 99
+    stats['extra'] = "x"
+
+    assert agent.get_stats()['conversation_turns'] == 0
+    assert 'extra' not in agent.get_stats()
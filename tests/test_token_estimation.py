@@ -0,0 +1,115 @@
+"""
+token计数测试 - 验证 estimate_tokens 在安装/未安装 tiktoken 时都可用
+
+运行方式:
+    python -m pytest tests/test_token_estimation.py
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+pytest.importorskip("pydantic")
+pytest.importorskip("langchain")
+
+from src.core.agents import base
+from src.core.agents.base import AgentResponse, BaseAgent, _encoding_for
+
+
+class _EchoAgent(BaseAgent):
+    """最小的具体Agent,只用于测试基类方法"""
+
+    def __init__(self, model: str, max_turns=None):
+        super().__init__(name="EchoAgent", max_turns=max_turns)
+        self._encoding = _encoding_for(model)
+
+    def run(self, user_input: str, **kwargs) -> AgentResponse:
+        return AgentResponse(success=True, output=user_input)
+
+    def clear_history(self) -> None:
+        self.conversation_history.clear()
+
+
+class _FakeEncoding:
+    """按空白分词的假分词器"""
+
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+
+@pytest.fixture(autouse=True)
+def clear_encoding_cache():
+    """分词器按模型缓存,每个用例前后清空,避免互相影响"""
+    _encoding_for.cache_clear()
+    yield
+    _encoding_for.cache_clear()
+
+
+def test_without_tiktoken(monkeypatch):
+    """未安装tiktoken时按约4字符1个token估算"""
+    monkeypatch.setattr(base, "tiktoken", None)
+
+    agent = _EchoAgent("gpt-4")
+    assert agent._encoding is None
+    assert agent.estimate_tokens("a" * 40) == 10
+    assert agent.estimate_tokens("") == 0
+
+
+def test_with_tiktoken(monkeypatch):
+    """安装tiktoken时使用模型对应的分词器计数"""
+    fake = SimpleNamespace(
+        encoding_for_model=lambda model: _FakeEncoding(),
+        get_encoding=lambda name: pytest.fail("已知模型不应回退到通用编码"),
+    )
+    monkeypatch.setattr(base, "tiktoken", fake)
+
+    agent = _EchoAgent("gpt-4")
+    assert agent.estimate_tokens("one two three") == 3
+
+
+def test_unknown_model_uses_generic_encoding(monkeypatch):
+    """未知模型回退到 cl100k_base"""
+    def encoding_for_model(model):
+        raise KeyError(model)
+
+    requested = []
+    fake = SimpleNamespace(
+        encoding_for_model=encoding_for_model,
+        get_encoding=lambda name: requested.append(name) or _FakeEncoding(),
+    )
+    monkeypatch.setattr(base, "tiktoken", fake)
+
+    agent = _EchoAgent("my-local-model")
+    assert requested == ["cl100k_base"]
+    assert agent.estimate_tokens("a b") == 2
+
+
+def test_encoding_load_failure_falls_back(monkeypatch):
+    """分词器加载失败(如离线无法下载编码文件)时回退到字符估算"""
+    def encoding_for_model(model):
+        raise OSError("network unavailable")
+
+    monkeypatch.setattr(base, "tiktoken", SimpleNamespace(encoding_for_model=encoding_for_model))
+
+    agent = _EchoAgent("gpt-4")
+    assert agent._encoding is None
+    assert agent.estimate_tokens("a" * 8) == 2
+
+
+@pytest.mark.parametrize("with_tiktoken", [False, True])
+def test_none_content(monkeypatch, with_tiktoken):
+    """模型返回 content=None 时按空回答记录,不抛出异常"""
+    fake = SimpleNamespace(encoding_for_model=lambda model: _FakeEncoding())
+    monkeypatch.setattr(base, "tiktoken", fake if with_tiktoken else None)
+
+    agent = _EchoAgent("gpt-4", max_turns=1)
+    assert agent.estimate_tokens(None) == 0
+
+    agent.append_turn("第一问", None)
+    assert agent.conversation_history[-1] == {"role": "assistant", "content": ""}
+
+    # 窗口已满,含空回答的一轮被压缩成摘要
+    agent.append_turn("第二问", "回答")
+    assert agent.memory_summaries[-1] == "用户: 第一问 → 助手: "
+    assert agent.user_turns == 2
@@ -11,7 +11,6 @@ LangChain工具库 - 为混合架构Agent提供丰富的工具集
 from langchain.tools import BaseTool
 from pydantic import BaseModel, Field
 from typing import Type, Optional, List, Dict, Any
-import math
 import re
 from datetime import datetime, timedelta
 import json
@@ -47,25 +46,10 @@ class CalculatorTool(BaseTool):
     
     def _run(self, expression: str) -> str:
         try:
-            # 安全的数学命名空间
-            safe_dict = {
-                'sqrt': math.sqrt,
-                'sin': math.sin,
-                'cos': math.cos,
-                'tan': math.tan,
-                'log': math.log,
-                'exp': math.exp,
-                'pi': math.pi,
-                'e': math.e,
-                'round': round,
-                'abs': abs,
-                'pow': pow,
-                'floor': math.floor,
-                'ceil': math.ceil,
-            }
+            # 与 src.tools.basic.calculator 共用经过语法白名单校验、幂运算有上限的求值器
+            from src.tools.basic.calculator import evaluate
             
-            result = eval(expression, {"__builtins__": {}}, safe_dict)
-            return str(result)
+            return str(evaluate(expression))
         except Exception as e:
             return f"计算错误: {str(e)}"
 
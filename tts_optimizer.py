@@ -12,11 +12,28 @@ import threading
 import queue
 import io
 import asyncio
-from typing import List, Dict, Optional, Callable
-from dataclasses import dataclass
+import logging
+from array import array
+from typing import List, Dict, Optional, Callable, Union
+from dataclasses import dataclass, field
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
+# 可选：uvloop 更快的事件循环（未安装时使用标准 asyncio）
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
+logger = logging.getLogger(__name__)
+
+
+def _debug_log(*args, **kwargs):
+    """非详细模式下的诊断输出：转给 logging.debug（默认级别下不写终端）"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(" ".join(str(arg) for arg in args))
+
 
 # ============================================================
 # 数据结构
@@ -45,6 +62,104 @@ class AudioChunk:
     duration: float = 0.0
 
 
+@dataclass
+class ChunkBatch:
+    """
+    TTS分段批（列式存储）
+    
+    每个分段的字段按列放在并行数组中，数值列使用紧凑的 array，
+    遍历时 zip(texts, lengths, pauses) 即可，无需逐段构造字典
+    """
+    ids: array = field(default_factory=lambda: array('I'))
+    texts: List[str] = field(default_factory=list)
+    lengths: array = field(default_factory=lambda: array('I'))
+    pauses: array = field(default_factory=lambda: array('H'))
+    
+    def __len__(self) -> int:
+        return len(self.texts)
+    
+    def append(self, chunk_id: int, text: str, length: int, pause_after: int):
+        """追加一个分段"""
+        self.ids.append(chunk_id)
+        self.texts.append(text)
+        self.lengths.append(length)
+        self.pauses.append(pause_after)
+    
+    def to_dicts(self) -> List[Dict]:
+        """转换为分段字典列表（optimize() 的返回格式）"""
+        return [
+            {
+                'chunk_id': chunk_id,
+                'text': text,
+                'pause_after': pause,
+                'length': length
+            }
+            for chunk_id, text, length, pause in zip(self.ids, self.texts, self.lengths, self.pauses)
+        ]
+
+
+# ============================================================
+# 文本清理规则（模块加载时编译一次，按顺序依次应用）
+# ============================================================
+
+_CLEANUP_RULES = (
+    # 移除代码块
+    (re.compile(r'```[\s\S]*?```'), '[代码内容]'),
+    # 移除行内代码
+    (re.compile(r'`([^`]+)`'), r'\1'),
+    # 移除链接
+    (re.compile(r'\[([^\]]+)\]\([^\)]+\)'), r'\1'),
+    # 移除markdown标题
+    (re.compile(r'^#{1,6}\s+', re.MULTILINE), ''),
+    # 移除列表标记
+    (re.compile(r'^\s*[-*+•]\s+', re.MULTILINE), ''),
+    (re.compile(r'^\s*\d+\.\s+', re.MULTILINE), ''),
+    # 移除加粗斜体
+    (re.compile(r'\*\*([^*]+)\*\*'), r'\1'),
+    (re.compile(r'\*([^*]+)\*'), r'\1'),
+    (re.compile(r'__([^_]+)__'), r'\1'),
+    (re.compile(r'_([^_]+)_'), r'\1'),
+    # 移除多余换行
+    (re.compile(r'\n{3,}'), '\n\n'),
+    # 移除JSON格式提示（如果有）
+    (re.compile(r'\{[\s\S]*?".*?"[\s\S]*?\}'), ''),
+)
+
+# 分句候选标点（句末标点 + 长句时的逗号/分号）
+_BOUNDARY_RE = re.compile(r'[。！？.!?，；,;]')
+
+# 长句按逗号/分号拆分
+_CLAUSE_SPLIT_RE = re.compile(r'([，；,;、])')
+
+# 连续空白
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# 流式断句候选：中英文句末标点、换行（英文句点需后跟空白，避免切开小数）
+_STREAM_BOUNDARY_RE = re.compile(r'[。！？!?\n]|\.(?=\s)')
+
+
+def _stream_split_point(text: str) -> int:
+    """
+    流式文本中最后一个可以安全断句的位置（0 表示暂不断句）
+    
+    以下位置不断句，避免把markdown标记拆开后单独读出：
+    - 代码块（```）或加粗（**）尚未闭合
+    - 行首的列表序号（如 "1. "）
+    """
+    end = 0
+    for match in _STREAM_BOUNDARY_RE.finditer(text):
+        i = match.start()
+        if text[i] == '.':
+            line_start = text.rfind('\n', 0, i) + 1
+            if text[line_start:i].strip().isdigit():
+                continue
+        prefix = text[:i + 1]
+        if prefix.count('```') % 2 or prefix.count('**') % 2:
+            continue
+        end = i + 1
+    return end
+
+
 # ============================================================
 # 文本优化器
 # ============================================================
@@ -76,11 +191,25 @@ class TTSTextOptimizer:
                 }
             ]
         """
+        return self.optimize_batch(text).to_dicts()
+    
+    def optimize_batch(self, text: str) -> ChunkBatch:
+        """
+        优化文本为TTS友好格式（列式结果）
+        
+        Args:
+            text: 原始AI输出文本
+            
+        Returns:
+            ChunkBatch: 分段编号/文本/长度/停顿 的并行数组
+        """
+        batch = ChunkBatch()
+        
         # 1. 清理格式
         clean_text = self._clean_formats(text)
         
         if not clean_text.strip():
-            return []
+            return batch
         
         # 2. 智能分句
         sentences = self._smart_split(clean_text)
@@ -94,67 +223,49 @@ class TTSTextOptimizer:
                 chunks.append(sent)
         
         # 4. 生成TTS结构
-        result = []
         for i, chunk in enumerate(chunks):
             if not chunk.strip():
                 continue
             
-            result.append({
-                'chunk_id': i,
-                'text': self._normalize_for_tts(chunk),
-                'pause_after': self._calculate_pause(chunk),
-                'length': len(chunk)
-            })
+            batch.append(
+                i,
+                self._normalize_for_tts(chunk),
+                len(chunk),
+                self._calculate_pause(chunk)
+            )
         
-        return result
+        return batch
     
     def _clean_formats(self, text: str) -> str:
         """清除markdown和特殊格式"""
-        # 移除代码块
-        text = re.sub(r'```[\s\S]*?```', '[代码内容]', text)
-        # 移除行内代码
-        text = re.sub(r'`([^`]+)`', r'\1', text)
-        # 移除链接
-        text = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', text)
-        # 移除markdown标题
-        text = re.sub(r'^#{1,6}\s+', '', text, flags=re.MULTILINE)
-        # 移除列表标记
-        text = re.sub(r'^\s*[-*+•]\s+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^\s*\d+\.\s+', '', text, flags=re.MULTILINE)
-        # 移除加粗斜体
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)
-        text = re.sub(r'__([^_]+)__', r'\1', text)
-        text = re.sub(r'_([^_]+)_', r'\1', text)
-        # 移除多余换行
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        # 移除JSON格式提示（如果有）
-        text = re.sub(r'\{[\s\S]*?".*?"[\s\S]*?\}', '', text)
+        for pattern, repl in _CLEANUP_RULES:
+            text = pattern.sub(repl, text)
         
         return text.strip()
     
     def _smart_split(self, text: str) -> List[str]:
-        """智能分句 - 考虑语义完整性"""
+        """智能分句 - 考虑语义完整性（只在候选标点处判断，不逐字符拼接）"""
         sentences = []
-        current = ""
+        start = 0
         
-        for i, char in enumerate(text):
-            current += char
+        for match in _BOUNDARY_RE.finditer(text):
+            i = match.start()
             
             # 句号、问号、感叹号
-            if char in '。！？.!?':
-                if self._is_sentence_end(text, i):
-                    sentences.append(current.strip())
-                    current = ""
+            if text[i] in '。！？.!?':
+                if not self._is_sentence_end(text, i):
+                    continue
             
             # 逗号/分号（长句时分割）
-            elif char in '，；,;' and len(current) > 50:
-                if i + 1 < len(text) and not text[i + 1].isdigit():
-                    sentences.append(current.strip())
-                    current = ""
+            elif i - start + 1 <= 50 or i + 1 >= len(text) or text[i + 1].isdigit():
+                continue
+            
+            sentences.append(text[start:i + 1].strip())
+            start = i + 1
         
-        if current.strip():
-            sentences.append(current.strip())
+        tail = text[start:].strip()
+        if tail:
+            sentences.append(tail)
         
         return [s for s in sentences if s]
     
@@ -177,7 +288,7 @@ class TTSTextOptimizer:
         chunks = []
         current = ""
         
-        for word in re.split(r'([，；,;、])', sentence):
+        for word in _CLAUSE_SPLIT_RE.split(sentence):
             if len(current + word) <= self.max_chunk_length:
                 current += word
             else:
@@ -206,7 +317,7 @@ class TTSTextOptimizer:
             text = text.replace(abbr, full)
         
         # 移除多余空格
-        text = re.sub(r'\s+', ' ', text)
+        text = _WHITESPACE_RE.sub(' ', text)
         
         return text.strip()
     
@@ -239,21 +350,26 @@ class TTSAudioManager:
                  tts_engine: Optional[Callable] = None,
                  max_retries: int = 3,
                  timeout_per_chunk: int = 10,
-                 buffer_size: int = 3):
+                 buffer_size: int = 3,
+                 verbose: bool = True):
         """
         Args:
             tts_engine: TTS引擎函数 (text -> audio_bytes)
             max_retries: 最大重试次数
             timeout_per_chunk: 每段超时时间（秒）
             buffer_size: 并发生成缓冲区大小
+            verbose: 是否打印逐段的生成/播放计时（关闭后转给 logging.debug）
         """
         self.tts_engine = tts_engine
         self.max_retries = max_retries
         self.timeout_per_chunk = timeout_per_chunk
         self.buffer_size = buffer_size
+        self._log = print if verbose else _debug_log
         
         # 播放控制
         self.play_lock = threading.Lock()
+        # 分片状态变化（生成完成/失败、流式追加）时唤醒播放线程
+        self._state_cond = threading.Condition()
         self.playback_finished = threading.Event()
         self.current_playing = None
         
@@ -266,9 +382,20 @@ class TTSAudioManager:
         self.generation_threads = []
         self.is_generating = False
         self.stop_requested = False
+        
+        # 流式模式（边生成文本边追加分片）
+        self._stream_open = False
+        self._stream_semaphore: Optional[threading.Semaphore] = None
+        self._stream_simulate = True
+        self._stream_result = True
+        self._playback_thread: Optional[threading.Thread] = None
+        
+        # 异步TTS事件循环（所有分片共用一个后台循环，并发请求在同一循环内重叠）
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
     
     def play_chunks(self, 
-                    tts_chunks: List[Dict], 
+                    tts_chunks: Union[ChunkBatch, List[Dict]], 
                     on_chunk_start: Optional[Callable] = None,
                     on_chunk_end: Optional[Callable] = None,
                     simulate_mode: bool = True) -> bool:
@@ -276,7 +403,7 @@ class TTSAudioManager:
         播放TTS分段
         
         Args:
-            tts_chunks: TTS文本优化器生成的分段列表
+            tts_chunks: TTS文本优化器生成的分段（ChunkBatch 或分段字典列表）
             on_chunk_start: 播放开始回调 (chunk_id, text)
             on_chunk_end: 播放结束回调 (chunk_id, success)
             simulate_mode: 是否模拟模式（无真实TTS引擎时）
@@ -284,21 +411,27 @@ class TTSAudioManager:
         Returns:
             bool: 是否全部成功播放
         """
-        self.total_chunks = len(tts_chunks)
+        if isinstance(tts_chunks, ChunkBatch):
+            texts, pauses = tts_chunks.texts, tts_chunks.pauses
+        else:
+            texts = [chunk['text'] for chunk in tts_chunks]
+            pauses = [chunk['pause_after'] for chunk in tts_chunks]
+        
+        self.total_chunks = len(texts)
         self.next_play_index = 0
         self.is_generating = True
         self.stop_requested = False
         
         # 初始化所有chunk
-        for i, chunk in enumerate(tts_chunks):
+        for i, (text, pause_after) in enumerate(zip(texts, pauses)):
             self.audio_chunks[i] = AudioChunk(
                 chunk_id=i,
-                text=chunk['text'],
-                pause_after=chunk['pause_after'],
+                text=text,
+                pause_after=pause_after,
                 status=AudioStatus.PENDING
             )
         
-        print(f"🚀 开始生成 {self.total_chunks} 段音频...")
+        self._log(f"🚀 开始生成 {self.total_chunks} 段音频...")
         
         # 启动生成线程（带并发控制）
         semaphore = threading.Semaphore(self.buffer_size)
@@ -322,6 +455,82 @@ class TTSAudioManager:
         self.is_generating = False
         return success
     
+    def start_stream(self,
+                     on_chunk_start: Optional[Callable] = None,
+                     on_chunk_end: Optional[Callable] = None,
+                     simulate_mode: bool = True):
+        """
+        开启流式播放：之后通过 submit_chunk 逐段追加，后台线程严格按顺序播放
+        
+        Args:
+            on_chunk_start: 播放开始回调 (chunk_id, text)
+            on_chunk_end: 播放结束回调 (chunk_id, success)
+            simulate_mode: 是否模拟模式（无真实TTS引擎时）
+        """
+        self.audio_chunks = {}
+        self.total_chunks = 0
+        self.next_play_index = 0
+        self.is_generating = True
+        self.stop_requested = False
+        
+        self._stream_open = True
+        self._stream_semaphore = threading.Semaphore(self.buffer_size)
+        self._stream_simulate = simulate_mode
+        self._stream_result = True
+        
+        def _playback():
+            self._stream_result = self._sequential_playback(
+                on_chunk_start=on_chunk_start,
+                on_chunk_end=on_chunk_end,
+                simulate_mode=simulate_mode
+            )
+        
+        self._playback_thread = threading.Thread(target=_playback, daemon=True)
+        self._playback_thread.start()
+    
+    def submit_chunk(self, text: str, pause_after: int = 500) -> int:
+        """
+        追加一个分片（流式模式），立即开始生成
+        
+        Returns:
+            int: 分片编号
+        """
+        chunk_id = self.total_chunks
+        self.audio_chunks[chunk_id] = AudioChunk(
+            chunk_id=chunk_id,
+            text=text,
+            pause_after=pause_after,
+            status=AudioStatus.PENDING
+        )
+        self.total_chunks += 1
+        
+        thread = threading.Thread(
+            target=self._generate_with_semaphore,
+            args=(chunk_id, self._stream_semaphore, self._stream_simulate),
+            daemon=True
+        )
+        thread.start()
+        self.generation_threads.append(thread)
+        
+        self._notify_state()
+        return chunk_id
+    
+    def finish_stream(self) -> bool:
+        """
+        结束流式输入并等待剩余分片播放完成
+        
+        Returns:
+            bool: 是否全部成功播放
+        """
+        self._stream_open = False
+        self._notify_state()
+        if self._playback_thread:
+            self._playback_thread.join()
+            self._playback_thread = None
+        
+        self.is_generating = False
+        return self._stream_result
+    
     def _generate_with_semaphore(self, chunk_id: int, semaphore: threading.Semaphore, simulate_mode: bool):
         """带信号量的生成（控制并发）"""
         with semaphore:
@@ -344,9 +553,9 @@ class TTSAudioManager:
                 break
             
             try:
-                print(f"🔄 [生成 {chunk_id + 1}/{self.total_chunks}] 尝试 {attempt + 1}/{self.max_retries}")
-                print(f"   ⏰ 开始时间: {ts_gen_start_str}")
-                print(f"   📝 文本长度: {len(chunk.text)} 字符")
+                self._log(f"🔄 [生成 {chunk_id + 1}/{self.total_chunks}] 尝试 {attempt + 1}/{self.max_retries}")
+                self._log(f"   ⏰ 开始时间: {ts_gen_start_str}")
+                self._log(f"   📝 文本长度: {len(chunk.text)} 字符")
                 
                 # ⏰ TTS 调用开始
                 ts_tts_start = time.perf_counter()
@@ -368,14 +577,15 @@ class TTSAudioManager:
                 chunk.audio_data = audio_data
                 chunk.duration = len(chunk.text) * 0.15  # 估算时长（秒）
                 chunk.status = AudioStatus.READY
+                self._notify_state()
                 
-                print(f"✅ [Chunk {chunk_id}] 生成成功")
-                print(f"   ⏰ 完成时间: {ts_gen_end_str}")
-                print(f"   📊 生成统计:")
-                print(f"      - TTS耗时: {tts_time*1000:.1f}ms")
-                print(f"      - 总耗时: {total_gen_time*1000:.1f}ms")
-                print(f"      - 音频大小: {len(audio_data):,} bytes")
-                print(f"      - 字符/秒: {len(chunk.text)/tts_time:.1f}")
+                self._log(f"✅ [Chunk {chunk_id}] 生成成功")
+                self._log(f"   ⏰ 完成时间: {ts_gen_end_str}")
+                self._log(f"   📊 生成统计:")
+                self._log(f"      - TTS耗时: {tts_time*1000:.1f}ms")
+                self._log(f"      - 总耗时: {total_gen_time*1000:.1f}ms")
+                self._log(f"      - 音频大小: {len(audio_data):,} bytes")
+                self._log(f"      - 字符/秒: {len(chunk.text)/tts_time:.1f}")
                 return
                 
             except TimeoutError:
@@ -394,6 +604,7 @@ class TTSAudioManager:
         
         # 所有重试失败
         chunk.status = AudioStatus.FAILED
+        self._notify_state()
         ts_fail = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         total_fail_time = time.perf_counter() - ts_gen_start
         print(f"💥 [Chunk {chunk_id}] 生成失败 at {ts_fail}")
@@ -407,25 +618,40 @@ class TTSAudioManager:
         """顺序播放（关键方法）"""
         all_success = True
         
-        while self.next_play_index < self.total_chunks and not self.stop_requested:
+        while (self.next_play_index < self.total_chunks or self._stream_open) and not self.stop_requested:
             chunk_id = self.next_play_index
+            
+            # 流式模式：下一段文本尚未提交，等待生产者
+            if chunk_id >= self.total_chunks:
+                with self._state_cond:
+                    self._state_cond.wait_for(
+                        lambda: chunk_id < self.total_chunks
+                        or not self._stream_open
+                        or self.stop_requested
+                    )
+                continue
+            
             chunk = self.audio_chunks[chunk_id]
             
-            # 等待当前chunk就绪（处理乱序）
-            wait_time = 0
+            # 等待当前chunk就绪（处理乱序）：生成完成时立即被唤醒，不再按秒轮询
             max_wait = self.timeout_per_chunk * 2
+            deadline = time.perf_counter() + max_wait
+            next_report = 0
             
-            while chunk.status not in [AudioStatus.READY, AudioStatus.FAILED]:
-                if wait_time >= max_wait or self.stop_requested:
-                    print(f"⏰ [Chunk {chunk_id}] 等待超时，跳过")
-                    chunk.status = AudioStatus.FAILED
-                    break
-                
-                if wait_time % 2 == 0:
-                    print(f"⏳ [等待 {chunk_id + 1}/{self.total_chunks}] {chunk.status.value}... ({wait_time}s)")
-                
-                time.sleep(1)
-                wait_time += 1
+            with self._state_cond:
+                while chunk.status not in (AudioStatus.READY, AudioStatus.FAILED):
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0 or self.stop_requested:
+                        print(f"⏰ [Chunk {chunk_id}] 等待超时，跳过")
+                        chunk.status = AudioStatus.FAILED
+                        break
+                    
+                    wait_time = max_wait - remaining
+                    if wait_time >= next_report:
+                        self._log(f"⏳ [等待 {chunk_id + 1}/{self.total_chunks}] {chunk.status.value}... ({int(wait_time)}s)")
+                        next_report += 2
+                    
+                    self._state_cond.wait(timeout=min(remaining, 2))
             
             # 播放或降级处理
             if chunk.status == AudioStatus.READY:
@@ -465,11 +691,11 @@ class TTSAudioManager:
             from datetime import datetime
             ts_start_str = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # 毫秒精度
             
-            print(f"\n{'─'*70}")
-            print(f"🔊 [播放 {chunk.chunk_id + 1}/{self.total_chunks}] {chunk.text[:40]}...")
-            print(f"⏰ 开始时间: {ts_start_str}")
-            print(f"   - perf_counter: {ts_start_perf:.6f}s")
-            print(f"   - wall_clock:   {ts_start_wall:.6f}s")
+            self._log(f"\n{'─'*70}")
+            self._log(f"🔊 [播放 {chunk.chunk_id + 1}/{self.total_chunks}] {chunk.text[:40]}...")
+            self._log(f"⏰ 开始时间: {ts_start_str}")
+            self._log(f"   - perf_counter: {ts_start_perf:.6f}s")
+            self._log(f"   - wall_clock:   {ts_start_wall:.6f}s")
             
             try:
                 # 阻塞式播放
@@ -478,7 +704,7 @@ class TTSAudioManager:
                 else:
                     play_result = self._blocking_play(chunk.audio_data)
                     if play_result:
-                        print(f"   音频播放耗时: {play_result['audio_duration']:.3f}s")
+                        self._log(f"   音频播放耗时: {play_result['audio_duration']:.3f}s")
                 
                 # ⏰ 时间戳：音频播放完成，开始停顿
                 ts_pause_start_perf = time.perf_counter()
@@ -499,15 +725,15 @@ class TTSAudioManager:
                 pause_time = ts_end_perf - ts_pause_start_perf
                 audio_time = ts_pause_start_perf - ts_start_perf
                 
-                print(f"✅ [完成 {chunk.chunk_id + 1}]")
-                print(f"⏰ 结束时间: {ts_end_str}")
-                print(f"   - perf_counter: {ts_end_perf:.6f}s")
-                print(f"   - wall_clock:   {ts_end_wall:.6f}s")
-                print(f"📊 耗时统计:")
-                print(f"   - 音频播放: {audio_time:.3f}s")
-                print(f"   - 停顿时间: {pause_time:.3f}s ({chunk.pause_after}ms)")
-                print(f"   - 总计时长: {total_time:.3f}s")
-                print(f"{'─'*70}\n")
+                self._log(f"✅ [完成 {chunk.chunk_id + 1}]")
+                self._log(f"⏰ 结束时间: {ts_end_str}")
+                self._log(f"   - perf_counter: {ts_end_perf:.6f}s")
+                self._log(f"   - wall_clock:   {ts_end_wall:.6f}s")
+                self._log(f"📊 耗时统计:")
+                self._log(f"   - 音频播放: {audio_time:.3f}s")
+                self._log(f"   - 停顿时间: {pause_time:.3f}s ({chunk.pause_after}ms)")
+                self._log(f"   - 总计时长: {total_time:.3f}s")
+                self._log(f"{'─'*70}\n")
                 
                 return True
                 
@@ -539,7 +765,7 @@ class TTSAudioManager:
             # 初始化 pygame mixer（如果尚未初始化）
             if not pygame.mixer.get_init():
                 pygame.mixer.init()
-                print(f"   🎵 pygame mixer 初始化完成")
+                self._log(f"   🎵 pygame mixer 初始化完成")
             
             # 从字节数据加载音频
             audio_io = io.BytesIO(audio_data)
@@ -550,12 +776,12 @@ class TTSAudioManager:
             ts_play_start_str = datetime.now().strftime("%H:%M:%S.%f")[:-3]
             load_time = ts_play_start - ts_load_start
             
-            print(f"   ⏰ 音频加载: {ts_load_start_str} -> {ts_play_start_str} ({load_time*1000:.1f}ms)")
-            print(f"   📦 音频大小: {len(audio_data):,} bytes")
+            self._log(f"   ⏰ 音频加载: {ts_load_start_str} -> {ts_play_start_str} ({load_time*1000:.1f}ms)")
+            self._log(f"   📦 音频大小: {len(audio_data):,} bytes")
             
             # 播放音频
             pygame.mixer.music.play()
-            print(f"   ▶️  开始播放: {ts_play_start_str}")
+            self._log(f"   ▶️  开始播放: {ts_play_start_str}")
             
             # 阻塞等待播放完成
             play_loop_count = 0
@@ -573,12 +799,12 @@ class TTSAudioManager:
             play_time = ts_play_end - ts_play_start
             total_time = ts_play_end - ts_load_start
             
-            print(f"   ⏹️  播放结束: {ts_play_end_str}")
-            print(f"   📊 播放统计:")
-            print(f"      - 加载耗时: {load_time*1000:.1f}ms")
-            print(f"      - 播放耗时: {play_time*1000:.1f}ms")
-            print(f"      - 总计耗时: {total_time*1000:.1f}ms")
-            print(f"      - 轮询次数: {play_loop_count}")
+            self._log(f"   ⏹️  播放结束: {ts_play_end_str}")
+            self._log(f"   📊 播放统计:")
+            self._log(f"      - 加载耗时: {load_time*1000:.1f}ms")
+            self._log(f"      - 播放耗时: {play_time*1000:.1f}ms")
+            self._log(f"      - 总计耗时: {total_time*1000:.1f}ms")
+            self._log(f"      - 轮询次数: {play_loop_count}")
             
             return {
                 'audio_duration': play_time,
@@ -642,31 +868,19 @@ class TTSAudioManager:
         if not self.tts_engine:
             raise Exception("TTS引擎未配置")
         
-        # 检查 TTS 引擎是否是 BaseTTS 实例（异步）
-        try:
-            from tts_interface import BaseTTS
-            if isinstance(self.tts_engine, BaseTTS):
-                # 异步 TTS 调用
-                try:
-                    loop = asyncio.get_event_loop()
-                except RuntimeError:
-                    # 如果没有运行中的事件循环，创建新的
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                
-                # 使用 asyncio.wait_for 实现超时
-                try:
-                    audio_data = loop.run_until_complete(
-                        asyncio.wait_for(
-                            self.tts_engine.synthesize(text),
-                            timeout=self.timeout_per_chunk
-                        )
-                    )
-                    return audio_data
-                except asyncio.TimeoutError:
-                    raise TimeoutError(f"TTS生成超时 ({self.timeout_per_chunk}秒)")
-        except ImportError:
-            pass
+        # 检查 TTS 引擎是否提供异步 synthesize（BaseTTS 接口）
+        # 按接口判断而不是 isinstance，根目录与 src 下的 tts_interface 都能识别
+        synthesize = getattr(self.tts_engine, 'synthesize', None)
+        if synthesize is not None and asyncio.iscoroutinefunction(synthesize):
+            # 异步 TTS 调用：提交到共享事件循环，使用 asyncio.wait_for 实现超时
+            future = asyncio.run_coroutine_threadsafe(
+                asyncio.wait_for(synthesize(text), timeout=self.timeout_per_chunk),
+                self._get_async_loop()
+            )
+            try:
+                return future.result()
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"TTS生成超时 ({self.timeout_per_chunk}秒)")
         
         # 同步 TTS 调用（兼容回调函数）
         with ThreadPoolExecutor(max_workers=1) as executor:
@@ -676,6 +890,48 @@ class TTSAudioManager:
             except FutureTimeoutError:
                 raise TimeoutError(f"TTS生成超时 ({self.timeout_per_chunk}秒)")
     
+    def warmup(self) -> bool:
+        """
+        预热本地资源：启动共享事件循环、初始化 pygame mixer
+        
+        不发网络请求：EdgeTTS 每次合成都新建连接，没有可复用的握手；
+        首句播放不再承担事件循环启动和音频设备初始化的延迟
+        
+        Returns:
+            bool: 预热是否成功
+        """
+        if not self.tts_engine:
+            return False
+        try:
+            synthesize = getattr(self.tts_engine, 'synthesize', None)
+            if synthesize is not None and asyncio.iscoroutinefunction(synthesize):
+                self._get_async_loop()
+            
+            import pygame
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            return True
+        except Exception:
+            return False
+    
+    def _get_async_loop(self) -> asyncio.AbstractEventLoop:
+        """获取（必要时启动）后台事件循环线程"""
+        with self._loop_lock:
+            if self._async_loop is None or self._async_loop.is_closed():
+                loop = uvloop.new_event_loop() if HAS_UVLOOP else asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever,
+                    name="tts-event-loop",
+                    daemon=True
+                ).start()
+                self._async_loop = loop
+            return self._async_loop
+    
+    def _notify_state(self):
+        """分片状态变化，唤醒等待中的播放线程"""
+        with self._state_cond:
+            self._state_cond.notify_all()
+    
     def _simulate_tts(self, text: str) -> bytes:
         """模拟TTS生成"""
         import random
@@ -704,6 +960,7 @@ class TTSAudioManager:
         self.stop_requested = True
         self.is_generating = False
         self.playback_finished.set()
+        self._notify_state()
         print("🛑 播放已停止")
 
 
@@ -722,7 +979,8 @@ class TTSOptimizer:
                  max_chunk_length: int = 100,
                  max_retries: int = 3,
                  timeout_per_chunk: int = 10,
-                 buffer_size: int = 3):
+                 buffer_size: int = 3,
+                 verbose: bool = True):
         """
         Args:
             tts_engine: TTS引擎函数
@@ -730,14 +988,20 @@ class TTSOptimizer:
             max_retries: 最大重试次数
             timeout_per_chunk: 每段超时时间
             buffer_size: 并发缓冲区大小
+            verbose: 是否打印详细的生成/播放过程
         """
         self.text_optimizer = TTSTextOptimizer(max_chunk_length)
         self.audio_manager = TTSAudioManager(
             tts_engine=tts_engine,
             max_retries=max_retries,
             timeout_per_chunk=timeout_per_chunk,
-            buffer_size=buffer_size
+            buffer_size=buffer_size,
+            verbose=verbose
         )
+        self._log = self.audio_manager._log
+        # 流式播放状态：已提交的分段、尚未凑满一句的文本
+        self._stream_chunks: List[Dict] = []
+        self._stream_buffer = ""
     
     def optimize_and_play(self,
                          text: str,
@@ -761,10 +1025,10 @@ class TTSOptimizer:
             }
         """
         # 1. 文本优化
-        print("📝 优化文本...")
-        tts_chunks = self.text_optimizer.optimize(text)
+        self._log("📝 优化文本...")
+        batch = self.text_optimizer.optimize_batch(text)
         
-        if not tts_chunks:
+        if not batch:
             print("⚠️  没有可播放内容")
             return {
                 'success': False,
@@ -772,11 +1036,11 @@ class TTSOptimizer:
                 'total_chunks': 0
             }
         
-        print(f"✅ 生成 {len(tts_chunks)} 个TTS分段")
+        self._log(f"✅ 生成 {len(batch)} 个TTS分段")
         
         # 2. 播放音频
         success = self.audio_manager.play_chunks(
-            tts_chunks,
+            batch,
             on_chunk_start=on_chunk_start,
             on_chunk_end=on_chunk_end,
             simulate_mode=simulate_mode
@@ -784,10 +1048,86 @@ class TTSOptimizer:
         
         return {
             'success': success,
-            'tts_chunks': tts_chunks,
-            'total_chunks': len(tts_chunks)
+            'tts_chunks': batch.to_dicts(),
+            'total_chunks': len(batch)
         }
     
+    def start_stream(self,
+                     on_chunk_start: Optional[Callable] = None,
+                     on_chunk_end: Optional[Callable] = None,
+                     simulate_mode: bool = True):
+        """
+        开启流式播放（生产者-消费者）
+        
+        之后用 feed 追加回答文本增量（或每得到一句完整文本就调用 submit_chunk），
+        最后调用 flush_stream 播放剩余文本、finish_stream 等待播放结束
+        """
+        self._stream_chunks = []
+        self._stream_buffer = ""
+        self.audio_manager.start_stream(
+            on_chunk_start=on_chunk_start,
+            on_chunk_end=on_chunk_end,
+            simulate_mode=simulate_mode
+        )
+    
+    def submit_chunk(self, text: str) -> int:
+        """
+        优化一段文本并追加到播放队列
+        
+        Returns:
+            int: 本次追加的TTS分段数
+        """
+        batch = self.text_optimizer.optimize_batch(text)
+        for chunk in batch.to_dicts():
+            chunk['chunk_id'] = self.audio_manager.submit_chunk(chunk['text'], chunk['pause_after'])
+            self._stream_chunks.append(chunk)
+        return len(batch)
+    
+    def feed(self, delta: str) -> int:
+        """
+        追加流式文本增量，凑满可安全断句的完整句子后再优化并送入播放队列
+        
+        Returns:
+            int: 本次追加的TTS分段数
+        """
+        self._stream_buffer += delta
+        end = _stream_split_point(self._stream_buffer)
+        if not end:
+            return 0
+        text, self._stream_buffer = self._stream_buffer[:end], self._stream_buffer[end:]
+        return self.submit_chunk(text)
+    
+    def flush_stream(self) -> int:
+        """
+        把 feed 缓冲中剩余的文本送入播放队列（回答生成完毕后调用）
+        
+        Returns:
+            int: 本次追加的TTS分段数
+        """
+        text, self._stream_buffer = self._stream_buffer, ""
+        if not text.strip():
+            return 0
+        return self.submit_chunk(text)
+    
+    def finish_stream(self) -> Dict:
+        """
+        结束流式输入并等待播放完成（未 flush 的缓冲文本会被丢弃）
+        
+        Returns:
+            与 optimize_and_play 相同结构的结果字典
+        """
+        self._stream_buffer = ""
+        success = self.audio_manager.finish_stream()
+        return {
+            'success': success and bool(self._stream_chunks),
+            'tts_chunks': self._stream_chunks,
+            'total_chunks': len(self._stream_chunks)
+        }
+    
+    def warmup(self) -> bool:
+        """预热TTS本地资源（可在后台线程调用）"""
+        return self.audio_manager.warmup()
+    
     def optimize_text_only(self, text: str) -> List[Dict]:
         """仅优化文本，不播放"""
         return self.text_optimizer.optimize(text)